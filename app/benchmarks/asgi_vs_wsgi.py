@@ -0,0 +1,106 @@
+"""
+Bandingkan throughput endpoint baca sync (WSGI, thread per request) dengan
+varian async (ASGI, satu event loop) di process yang sama.
+
+    cd app
+    python -m benchmarks.asgi_vs_wsgi --requests 2000 --concurrency 50
+
+Handler dipanggil in-process lewat django.test Client / AsyncClient (tanpa
+socket), jadi yang diukur adalah biaya stack Django + Ninja + ORM + cache.
+Untuk angka end-to-end jalankan gunicorn vs uvicorn dan arahkan load driver
+ke sana.
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import AsyncClient, Client  # noqa: E402
+
+from lms.auth import create_token  # noqa: E402
+from lms.models import User  # noqa: E402
+
+from .fixtures import PROFILES, seed  # noqa: E402
+from .loadtest import summarize  # noqa: E402
+
+ENDPOINTS = ("courses", "lessons", "assignments", "submissions")
+
+
+def run_wsgi(path, headers, total, concurrency):
+    local = threading.local()
+    latencies = []
+
+    def one(_):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = Client()
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_asgi(path, headers, total, concurrency):
+    client = AsyncClient()
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--profile", choices=PROFILES, default="small")
+    parser.add_argument("--output", help="tulis hasil JSON ke file ini")
+    args = parser.parse_args()
+
+    seed(args.profile)
+    admin = User.objects.filter(role="admin").order_by("id").first()
+    headers = {"Authorization": f"Bearer {create_token(admin)}"}
+
+    results = {}
+    for name in ENDPOINTS:
+        results[name] = {
+            "wsgi": run_wsgi(f"/api/lms/{name}", headers, args.requests, args.concurrency),
+            "asgi": asyncio.run(
+                run_asgi(f"/api/lms/async/{name}", headers, args.requests, args.concurrency)
+            ),
+        }
+
+    report = json.dumps(
+        {"requests": args.requests, "concurrency": args.concurrency, "results": results},
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Bandingkan dua hasil benchmarks.loadtest (mis. sebelum vs sesudah commit).
+
+    python -m benchmarks.compare bench-base.json bench-head.json --threshold 10
+
+Exit code 1 kalau ada skenario yang throughput-nya turun atau p95/p99-nya
+naik lebih dari --threshold persen, atau query per request bertambah.
+Tidak butuh Django.
+"""
+import argparse
+import json
+import sys
+
+# metrik -> True kalau nilai lebih besar = lebih baik
+METRICS = {
+    "rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "queries_per_request": False,
+}
+
+
+def _change(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(base, head, threshold):
+    rows, regressions = [], []
+    for scenario in sorted(set(base["results"]) | set(head["results"])):
+        old = base["results"].get(scenario, {})
+        new = head["results"].get(scenario, {})
+        for metric, higher_is_better in METRICS.items():
+            a, b = old.get(metric), new.get(metric)
+            if a is None and b is None:
+                continue
+            change = _change(a, b)
+            worse = False
+            if metric == "queries_per_request":
+                worse = a is not None and b is not None and b > a
+            elif change is not None:
+                worse = -change > threshold if higher_is_better else change > threshold
+            rows.append((scenario, metric, a, b, change, worse))
+            if worse:
+                regressions.append(f"{scenario}.{metric}")
+    return rows, regressions
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:g}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan dua hasil loadtest")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="toleransi regresi dalam persen (default 10)")
+    args = parser.parse_args()
+
+    with open(args.base) as fh:
+        base = json.load(fh)
+    with open(args.head) as fh:
+        head = json.load(fh)
+
+    print(f"base {base['meta'].get('commit')}  ->  head {head['meta'].get('commit')}")
+    print(f"{'scenario':<20}{'metric':<22}{'base':>12}{'head':>12}{'change':>10}")
+    rows, regressions = compare(base, head, args.threshold)
+    for scenario, metric, a, b, change, worse in rows:
+        pct = "-" if change is None else f"{change:+.1f}%"
+        flag = "  REGRESSION" if worse else ""
+        print(f"{scenario:<20}{metric:<22}{_fmt(a):>12}{_fmt(b):>12}{pct:>10}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Generator data benchmark yang deterministik (random seed tetap): user per
+role, course, lesson, assignment, dan submission dengan volume realistis.
+
+    cd app
+    python -m benchmarks.fixtures --profile medium
+
+Semua user memakai password BENCH_PASSWORD. Database dikosongkan dulu
+(manage.py flush) supaya dua run dengan profile + seed yang sama identik.
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from datetime import timedelta  # noqa: E402
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from lms.models import User, Course, Lesson, Assignment, Submission  # noqa: E402
+from lms.counters import recount  # noqa: E402
+from lms.search import rebuild_index  # noqa: E402
+
+BENCH_PASSWORD = "bench-pass"
+BATCH_SIZE = 2000
+
+# students_per_course = mahasiswa yang "mengambil" course (yang bisa submit)
+PROFILES = {
+    "small": dict(
+        admins=1, dosen=5, mahasiswa=200, courses=20, lessons_per_course=10,
+        assignments_per_course=5, students_per_course=30, submission_rate=0.6,
+    ),
+    "medium": dict(
+        admins=2, dosen=20, mahasiswa=2000, courses=100, lessons_per_course=20,
+        assignments_per_course=10, students_per_course=60, submission_rate=0.6,
+    ),
+    "large": dict(
+        admins=5, dosen=100, mahasiswa=20000, courses=1000, lessons_per_course=30,
+        assignments_per_course=12, students_per_course=80, submission_rate=0.7,
+    ),
+}
+
+WORDS = (
+    "pemrograman server django api basis data indeks cache redis query "
+    "transaksi keamanan autentikasi jaringan algoritma struktur objek "
+    "pengujian performa deployment kontainer async antrian migrasi"
+).split()
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _users(role, count, password):
+    return [
+        User(username=f"bench-{role}-{i}", email=f"{role}{i}@bench.local",
+             role=role, password=password, is_staff=role == "admin")
+        for i in range(count)
+    ]
+
+
+def seed(profile="small", seed=42, flush=True, **overrides):
+    """Isi database dengan data benchmark. Return ringkasan jumlah baris per tabel."""
+    params = {**PROFILES[profile], **overrides}
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    call_command("migrate", verbosity=0)
+    if flush:
+        call_command("flush", interactive=False, verbosity=0)
+
+    # satu hash untuk semua user: seeding ribuan user tidak perlu hashing per baris
+    password = make_password(BENCH_PASSWORD)
+    with transaction.atomic():
+        for role in ("admin", "dosen", "mahasiswa"):
+            count = params["admins" if role == "admin" else role]
+            User.objects.bulk_create(_users(role, count, password), batch_size=BATCH_SIZE)
+        dosen = list(User.objects.filter(role="dosen").values_list("id", flat=True))
+        students = list(User.objects.filter(role="mahasiswa").values_list("id", flat=True))
+
+        Course.objects.bulk_create(
+            (
+                Course(title=f"{_text(rng, 3).title()} {i}", description=_text(rng, 40),
+                       instructor_id=rng.choice(dosen))
+                for i in range(params["courses"])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        course_ids = list(Course.objects.values_list("id", flat=True))
+
+        Lesson.objects.bulk_create(
+            (
+                Lesson(course_id=c, title=f"{_text(rng, 4).capitalize()} {i}",
+                       content=_text(rng, 300))
+                for c in course_ids for i in range(params["lessons_per_course"])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        now = timezone.now()
+        Assignment.objects.bulk_create(
+            (
+                Assignment(course_id=c, title=f"Tugas {i + 1}",
+                           deadline=now + timedelta(days=rng.randint(-30, 60)))
+                for c in course_ids for i in range(params["assignments_per_course"])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        per_course = min(params["students_per_course"], len(students))
+        roster = {c: rng.sample(students, per_course) for c in course_ids}
+        submissions = (
+            Submission(assignment_id=a, student_id=s, answer=_text(rng, 60),
+                       grade=rng.randint(40, 100) if rng.random() < 0.5 else None)
+            for a, c in Assignment.objects.values_list("id", "course_id").iterator()
+            for s in roster[c]
+            if rng.random() < params["submission_rate"]
+        )
+        Submission.objects.bulk_create(submissions, batch_size=BATCH_SIZE)
+
+    # bulk_create tidak memicu signal: bangun ulang index full-text dan
+    # agregat counter sekali
+    rebuild_index()
+    recount()
+
+    return {
+        "profile": profile,
+        "seed": seed,
+        "params": params,
+        "rows": {
+            model.__name__.lower(): model.objects.count()
+            for model in (User, Course, Lesson, Assignment, Submission)
+        },
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed data benchmark lms")
+    parser.add_argument("--profile", choices=PROFILES, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(seed(args.profile, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Biaya encode JSON per request, sebelum vs sesudah renderer orjson + response
+tanpa validasi ulang schema:
+
+    cd app
+    python -m benchmarks.json_encoding --rounds 5
+
+Payload sintetis (tanpa DB) dengan bentuk yang sama seperti response asli:
+satu page GET /courses (50 item), satu page GET /submissions (200 item), dan
+gradebook 1000 mahasiswa x 50 assignment. Kolom:
+
+    ninja_stdlib   jalur lama: PageSchema validate + dump, lalu json stdlib
+    stdlib         json.dumps(cls=NinjaJSONEncoder) saja
+    fast           lms.renderers.json_dumps (orjson kalau ter-install)
+    ninja_fast     PageSchema validate + dump, lalu json_dumps (renderer baru)
+
+Endpoint list sekarang memakai jalur `fast` (json_response, tanpa schema).
+"""
+import argparse
+import json
+import os
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from ninja.responses import NinjaJSONEncoder  # noqa: E402
+
+from lms import renderers  # noqa: E402
+from lms.schemas import PageSchema  # noqa: E402
+
+NOW = datetime(2026, 1, 1, 8, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def courses_page(rng, n=50):
+    return {
+        "items": [
+            {
+                "id": 10_000 - i, "title": f"Pemrograman Sisi Server {i}",
+                "description": "Django, Ninja, Redis dan PostgreSQL " * 8,
+                "instructor_id": rng.randint(1, 100), "created_at": NOW - timedelta(hours=i),
+                "lesson_count": rng.randint(5, 30), "assignment_count": rng.randint(1, 12),
+            }
+            for i in range(n)
+        ],
+        "next": "OTk1MA",
+    }
+
+
+def submissions_page(rng, n=200):
+    return {
+        "items": [
+            {
+                "id": 50_000 + i, "answer": "jawaban mahasiswa " * 20,
+                "grade": rng.choice([None, 60, 75, 90]), "student_id": rng.randint(1, 2000),
+                "assignment_id": rng.randint(1, 1000), "file": None,
+            }
+            for i in range(n)
+        ],
+        "next": "NTAyMDA",
+    }
+
+
+def gradebook(rng, students=1000, assignments=50):
+    return {
+        "course_id": 1,
+        "assignments": [
+            {"id": j, "title": f"Tugas {j}", "deadline": NOW + timedelta(days=j)}
+            for j in range(assignments)
+        ],
+        "students": [{"id": i, "username": f"mhs{i:05d}"} for i in range(students)],
+        "grades": [
+            [rng.choice([None, 55, 70, 85, 100]) for _ in range(assignments)]
+            for _ in range(students)
+        ],
+    }
+
+
+def _stdlib(data):
+    return json.dumps(data, cls=NinjaJSONEncoder).encode()
+
+
+def _via_schema(encode):
+    # yang dikerjakan Ninja untuk response=PageSchema sebelum renderer dipanggil
+    return lambda data: encode(PageSchema.model_validate(data).model_dump())
+
+
+def _best_us(func, data, rounds):
+    timer = timeit.Timer(lambda: func(data))
+    number, _ = timer.autorange()
+    return round(min(timer.repeat(rounds, number)) / number * 1e6, 1)
+
+
+def run(rounds):
+    rng = random.Random(42)
+    payloads = {
+        "courses_page": (courses_page(rng), True),
+        "submissions_page": (submissions_page(rng), True),
+        "gradebook_1000x50": (gradebook(rng), False),
+    }
+    results = {}
+    for name, (data, paged) in payloads.items():
+        # nilai harus sama persis sebelum membandingkan kecepatan
+        assert json.loads(_stdlib(data)) == json.loads(renderers.json_dumps(data)), name
+        row = {
+            "bytes": len(renderers.json_dumps(data)),
+            "stdlib_us": _best_us(_stdlib, data, rounds),
+            "fast_us": _best_us(renderers.json_dumps, data, rounds),
+        }
+        if paged:
+            row["ninja_stdlib_us"] = _best_us(_via_schema(_stdlib), data, rounds)
+            row["ninja_fast_us"] = _best_us(_via_schema(renderers.json_dumps), data, rounds)
+            row["speedup"] = round(row["ninja_stdlib_us"] / row["fast_us"], 1)
+        else:
+            row["speedup"] = round(row["stdlib_us"] / row["fast_us"], 1)
+        results[name] = row
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark encode JSON response")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps({
+        "backend": "orjson" if renderers.orjson is not None else "stdlib",
+        "results": run(args.rounds),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Load driver untuk endpoint utama lms: login, list courses, list submissions,
+dan create_submission, masing-masing pada concurrency tetap.
+
+    cd app
+    python -m benchmarks.loadtest --profile small --requests 500 --concurrency 20 \\
+        --output bench-$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare bench-old.json bench-new.json
+
+Default in-process (django.test Client per thread, tanpa socket) sehingga
+query per request bisa dihitung. Dengan --base-url request dikirim lewat HTTP
+ke server yang berjalan dengan DJANGO_SETTINGS_MODULE=benchmarks.settings dan
+database yang sama (seed dulu dengan `python -m benchmarks.fixtures`, lalu
+jalankan loadtest dengan --no-seed).
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from urllib.parse import urlencode, urlsplit
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from lms.auth import create_token  # noqa: E402
+from lms.models import User, Assignment, Submission  # noqa: E402
+
+from .fixtures import BENCH_PASSWORD, PROFILES, seed  # noqa: E402
+
+SCENARIOS = ("login", "courses", "submissions", "create_submission")
+
+
+# ---------- transport ----------
+class InProcessTransport:
+    """django.test.Client per thread + penghitung query per koneksi DB thread itu."""
+
+    counts_queries = True
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, "client"):
+            state.client = Client()
+            state.queries = 0
+
+            def counter(execute, sql, params, many, context):
+                state.queries += 1
+                return execute(sql, params, many, context)
+
+            # koneksi DB Django per thread: wrapper ini hanya melihat query thread ini
+            connection.execute_wrappers.append(counter)
+        return state
+
+    def request(self, method, path, headers, body=None):
+        state = self._state()
+        before = state.queries
+        if method == "GET":
+            response = state.client.get(path, headers=headers)
+        else:
+            response = state.client.post(
+                path, data=body or "", content_type="application/json", headers=headers
+            )
+        if getattr(response, "streaming", False):
+            b"".join(response.streaming_content)
+        return response.status_code, state.queries - before
+
+
+class HttpTransport:
+    """Koneksi HTTP keep-alive per thread ke --base-url."""
+
+    counts_queries = False
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self._conn_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._local = threading.local()
+
+    def request(self, method, path, headers, body=None):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._conn_class(self._netloc, timeout=30)
+        headers = dict(headers)
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        try:
+            conn.request(method, self._prefix + path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+        return response.status, None
+
+
+# ---------- skenario ----------
+class Workload:
+    """Data yang dibutuhkan skenario: token, user login, pasangan submission baru."""
+
+    def __init__(self):
+        admin = User.objects.filter(role="admin").order_by("id").first()
+        student = User.objects.filter(role="mahasiswa").order_by("id").first()
+        if admin is None or student is None:
+            raise SystemExit("Database kosong: jalankan benchmarks.fixtures dulu")
+        self.admin_headers = {"Authorization": f"Bearer {create_token(admin)}"}
+        self.student_headers = {"Authorization": f"Bearer {create_token(student)}"}
+        self.usernames = list(
+            User.objects.filter(role="mahasiswa").order_by("id").values_list("username", flat=True)
+        )
+        self._students = list(
+            User.objects.filter(role="mahasiswa").order_by("id").values_list("id", flat=True)
+        )
+        self._assignments = list(Assignment.objects.order_by("id").values_list("id", flat=True))
+        self._taken = set(Submission.objects.values_list("assignment_id", "student_id"))
+        self._pairs = self._free_pairs()
+        self._lock = threading.Lock()
+        self._seq = count()
+
+    def _free_pairs(self):
+        # pasangan (assignment, student) yang belum ada submission-nya, urutan tetap
+        for assignment_id in self._assignments:
+            for student_id in self._students:
+                if (assignment_id, student_id) not in self._taken:
+                    yield assignment_id, student_id
+
+    def next_pair(self):
+        with self._lock:
+            return next(self._pairs)
+
+    def request_for(self, scenario):
+        """-> (method, path, headers, body, expected status)."""
+        n = next(self._seq)
+        if scenario == "login":
+            query = urlencode({
+                "username": self.usernames[n % len(self.usernames)],
+                "password": BENCH_PASSWORD,
+            })
+            return "POST", f"/api/lms/login?{query}", {}, None, 200
+        if scenario == "courses":
+            return "GET", "/api/lms/courses", self.admin_headers, None, 200
+        if scenario == "submissions":
+            return "GET", "/api/lms/submissions", self.admin_headers, None, 200
+        if scenario == "create_submission":
+            assignment_id, student_id = self.next_pair()
+            body = json.dumps(
+                {"answer": "jawaban benchmark", "student_id": student_id,
+                 "assignment_id": assignment_id}
+            )
+            return "POST", "/api/lms/submissions", self.student_headers, body, 200
+        raise ValueError(scenario)
+
+
+def _percentile(sorted_values, pct):
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors=0, queries=None):
+    latencies = sorted(latencies)
+    ms = lambda s: round(s * 1000, 2)  # noqa: E731
+    result = {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": ms(statistics.median(latencies)) if latencies else None,
+        "p95_ms": ms(_percentile(latencies, 95)) if latencies else None,
+        "p99_ms": ms(_percentile(latencies, 99)) if latencies else None,
+        "max_ms": ms(latencies[-1]) if latencies else None,
+    }
+    if queries is not None:
+        result["queries_per_request"] = round(statistics.mean(queries), 2) if queries else None
+    return result
+
+
+def run_scenario(transport, workload, scenario, total, concurrency, warmup=0):
+    latencies, queries = [], []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(record):
+        nonlocal errors
+        method, path, headers, body, expected = workload.request_for(scenario)
+        started = time.perf_counter()
+        try:
+            status, n_queries = transport.request(method, path, headers, body)
+        except Exception:
+            status, n_queries = None, None
+        elapsed = time.perf_counter() - started
+        if not record:
+            return
+        with lock:
+            latencies.append(elapsed)
+            if status != expected:
+                errors += 1
+            if n_queries is not None:
+                queries.append(n_queries)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: one(False), range(warmup)))
+        started = time.perf_counter()
+        list(pool.map(lambda _: one(True), range(total)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(
+        latencies, elapsed, errors, queries if transport.counts_queries else None
+    )
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(__file__), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test endpoint lms")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"dipisah koma, pilihan: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=500, help="request per skenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=50, help="request pemanasan (tidak diukur)")
+    parser.add_argument("--profile", choices=PROFILES, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-seed", action="store_true", help="pakai data yang sudah ada")
+    parser.add_argument("--base-url", help="mis. http://127.0.0.1:8000 (default in-process)")
+    parser.add_argument("--output", help="tulis hasil JSON ke file ini")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(sorted(unknown))}")
+
+    fixtures = None if args.no_seed else seed(args.profile, args.seed)
+    workload = Workload()
+    transport = HttpTransport(args.base_url) if args.base_url else InProcessTransport()
+
+    results = {
+        scenario: run_scenario(
+            transport, workload, scenario, args.requests, args.concurrency, args.warmup
+        )
+        for scenario in scenarios
+    }
+
+    report = json.dumps({
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "cache": settings.CACHES["redis"]["BACKEND"],
+            "target": args.base_url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "fixtures": fixtures,
+        },
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
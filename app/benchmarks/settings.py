@@ -0,0 +1,52 @@
+"""
+Settings untuk benchmark lokal: SQLite file sementara (atau LMS_BENCH_DATABASE_URL)
++ Redis in-process (fakeredis, fallback locmem), kecuali LMS_BENCH_REDIS_URL
+di-set (maka L2 = Redis sungguhan). Rate limit dimatikan supaya load driver
+tidak kena 429.
+"""
+import os
+import tempfile
+
+from simple_lms.database import database_config
+from simple_lms.settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+DATABASES = {
+    "default": database_config(
+        os.getenv("LMS_BENCH_DATABASE_URL")
+        or "sqlite:///" + os.path.join(tempfile.gettempdir(), "lms_bench.sqlite3")
+    ),
+}
+
+_bench_redis = os.getenv("LMS_BENCH_REDIS_URL")
+if _bench_redis:
+    CACHES["redis"] = {  # noqa: F405
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": _bench_redis,
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+    }
+else:
+    try:
+        import fakeredis
+    except ImportError:
+        CACHES["redis"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}  # noqa: F405
+    else:
+        # Redis palsu in-process: Lua (rate limit), pub/sub (L1) tetap jalan
+        CACHES["redis"] = {  # noqa: F405
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://bench-fakeredis:6379/1",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CONNECTION_POOL_KWARGS": {"connection_class": fakeredis.FakeConnection},
+            },
+        }
+        # aget() async tetap lewat redis.asyncio (server fakeredis yang sama)
+        CACHES["default"]["OPTIONS"]["ASYNC_CONNECTION_CLASS"] = (  # noqa: F405
+            "fakeredis.aioredis.FakeConnection"
+        )
+
+LMS_RATELIMIT_ENABLED = False
+
+# seeding ribuan user tidak perlu PBKDF2 asli
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
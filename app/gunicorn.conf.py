@@ -0,0 +1,57 @@
+"""
+Profil production: gunicorn dengan worker per core.
+
+    SERVER_MODE=wsgi  -> gthread worker (simple_lms.wsgi)
+    SERVER_MODE=asgi  -> uvicorn worker (simple_lms.asgi)
+
+Override via env: WEB_CONCURRENCY (jumlah worker), GUNICORN_THREADS, PORT.
+"""
+import multiprocessing
+import os
+
+_asgi = os.getenv("SERVER_MODE", "wsgi") == "asgi"
+
+wsgi_app = "simple_lms.asgi:application" if _asgi else "simple_lms.wsgi:application"
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+_cpus = multiprocessing.cpu_count()
+
+workers = int(os.getenv("WEB_CONCURRENCY", _cpus * 2 + 1))
+if _asgi:
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    worker_class = "gthread"
+    # thread per worker ikut jumlah core (request banyak menunggu DB/Redis),
+    # tapi tidak melebihi pool koneksi DB per worker (DB_POOL_MAX_SIZE, lihat
+    # simple_lms/database.py): thread di atas itu hanya antre koneksi
+    threads = int(os.getenv(
+        "GUNICORN_THREADS", min(max(2, _cpus * 2), int(os.getenv("DB_POOL_MAX_SIZE", "10")))
+    ))
+
+# import Django sekali di master, worker di-fork (copy-on-write, start cepat)
+preload_app = True
+
+# recycle worker berkala supaya memory leak tidak menumpuk
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-" if os.getenv("GUNICORN_ACCESS_LOG", "0") == "1" else None
+errorlog = "-"
+
+
+def on_starting(server):
+    # snapshot metrics dari run sebelumnya (lms/metrics.py) tidak ikut dijumlah
+    metrics_dir = os.getenv("LMS_METRICS_DIR")
+    if metrics_dir and os.path.isdir(metrics_dir):
+        for name in os.listdir(metrics_dir):
+            if name.endswith((".json", ".tmp")):
+                os.remove(os.path.join(metrics_dir, name))
+
+
+def post_fork(server, worker):
+    # koneksi DB yang mungkin terbuka di master tidak boleh dipakai bersama
+    from django.db import connections
+    connections.close_all()
@@ -1,6 +1,23 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from .models import User, Course, Lesson, Assignment, Submission
+from .search import match_filter
+
+
+class FullTextSearchMixin:
+    """
+    Search box changelist: lookup search_fields biasa (termasuk relasi, mis.
+    username instruktur) di-OR-kan dengan hit index full-text (search.py)
+    untuk kolom teks panjang yang tidak ada di search_fields.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        matches = match_filter(self.model, search_term)
+        if matches is not None:
+            # subquery di SQL yang sama, bukan daftar id hasil search()
+            results |= queryset.filter(matches)
+        return results, may_have_duplicates
 
 
 @admin.register(User)
@@ -14,14 +31,14 @@ class UserAdmin(DjangoUserAdmin):
 
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
-    list_display = ("title", "instructor")
+class CourseAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ("title", "instructor", "lesson_count", "assignment_count")
     search_fields = ("title", "instructor__username")
     list_filter = ("instructor",)
 
 
 @admin.register(Lesson)
-class LessonAdmin(admin.ModelAdmin):
+class LessonAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("title", "course")
     search_fields = ("title", "course__title")
     list_filter = ("course",)
@@ -29,7 +46,9 @@ class LessonAdmin(admin.ModelAdmin):
 
 @admin.register(Assignment)
 class AssignmentAdmin(admin.ModelAdmin):
-    list_display = ("title", "course", "deadline")
+    list_display = (
+        "title", "course", "deadline", "submission_count", "graded_count", "average_grade",
+    )
     search_fields = ("title", "course__title")
     list_filter = ("course",)
 
@@ -1,19 +1,47 @@
-from ninja import Router
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from ninja import Router, File
+from ninja.files import UploadedFile
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
-from django.contrib.auth import authenticate
 from ninja.errors import HttpError
-from django.core.cache import cache
 
 from .models import User, Course, Lesson, Assignment, Submission
 from .schemas import (
     UserSchema,
     RegisterSchema,
-    CourseSchema, CourseCreateSchema,
+    CourseSchema, CourseCreateSchema, CourseDetailSchema,
     LessonSchema, LessonCreateSchema,
     AssignmentSchema, AssignmentCreateSchema,
-    SubmissionSchema, SubmissionCreateSchema
+    SubmissionSchema, SubmissionCreateSchema,
+    UploadCreateSchema, UploadStatusSchema,
+    PageSchema, BulkResultSchema, SearchHitSchema,
+    GradeSchema, GradeResultSchema,
 )
 from .auth import create_token, JWTAuth
+from .hashing import hash_password, verify_password
+from .ratelimit import RateLimit, client_ip, rate_limit
+from .db_router import read_from_replica
+from .pagination import PAGE_DEFAULT_LIMIT, apaginate, paginate
+from .bulk import bulk_create_in_courses, bulk_grade, read_csv_rows, validate_rows
+from .export import EXPORT_CONTENT_TYPES, stream_queryset
+from .filters import (
+    assignment_page_key, assignment_queryset, lesson_queryset, submission_queryset,
+)
+from . import search as fulltext
+from . import uploads
+from .downloads import file_url_rows, serve_file, with_file_urls
+from .cache import COURSE_CACHE_KEY, COURSE_CACHE_TTL, cached_build
+from .gradebook import (
+    GRADEBOOK_CACHE_KEY, GRADEBOOK_CACHE_TTL, GRADEBOOK_FORMATS, build_gradebook,
+)
+from .http import (
+    bytes_response, cached_json_response, etag_matches, json_response, not_modified,
+)
+from .metrics import record_cache
 
 router = Router()
 
@@ -33,21 +61,23 @@ def allow_roles(*roles):
 
 # ======================
 # RATE LIMITING (LOGIN) - WAJIB UAS
+# atomic sliding window per IP dan per username (lihat ratelimit.py)
 # ======================
 LOGIN_RL_MAX = 5
 LOGIN_RL_WINDOW = 60  # detik
 
-def _client_ip(request):
-    xff = request.META.get("HTTP_X_FORWARDED_FOR")
-    if xff:
-        return xff.split(",")[0].strip()
-    return request.META.get("REMOTE_ADDR", "unknown")
+LOGIN_RL_IP = RateLimit("login:ip", f"{LOGIN_RL_MAX}/{LOGIN_RL_WINDOW}s")
+LOGIN_RL_USER = RateLimit("login:user", f"{LOGIN_RL_MAX}/{LOGIN_RL_WINDOW}s")
+
+REGISTER_RATE = "10/h"
+SUBMISSION_RATE = "30/m"
 
 
 # ======================
 # AUTH - REGISTER (WAJIB UAS)
 # ======================
 @router.post("/register", response=UserSchema)
+@rate_limit("register", REGISTER_RATE, key="ip")
 def register(request, data: RegisterSchema):
     if data.role not in ("admin", "dosen", "mahasiswa"):
         raise HttpError(400, "Invalid role")
@@ -55,12 +85,14 @@ def register(request, data: RegisterSchema):
     if User.objects.filter(username=data.username).exists():
         raise HttpError(400, "Username already exists")
 
-    user = User.objects.create_user(
-        username=data.username,
-        password=data.password,
-        email=data.email or "",
+    # hashing di pool terbatas, bukan di thread request
+    user = User(
+        username=User.normalize_username(data.username),
+        email=User.objects.normalize_email(data.email or ""),
         role=data.role,
+        password=hash_password(data.password),
     )
+    user.save()
     return user
 
 
@@ -69,19 +101,24 @@ def register(request, data: RegisterSchema):
 # ======================
 @router.post("/login")
 def login(request, username: str, password: str):
-    ip = _client_ip(request)
-    key = f"rl:login:{ip}"
-
-    attempts = cache.get(key, 0)
-    if attempts >= LOGIN_RL_MAX:
-        raise HttpError(429, "Too many login attempts. Try again later.")
-
-    user = authenticate(username=username, password=password)
-    if not user:
-        cache.set(key, attempts + 1, LOGIN_RL_WINDOW)
+    ip = client_ip(request)
+
+    # setiap percobaan langsung dihitung (check + increment atomic),
+    # login sukses me-reset counter
+    message = "Too many login attempts. Try again later."
+    LOGIN_RL_IP.check(ip, message)
+    LOGIN_RL_USER.check(username, message)
+
+    user = User.objects.filter(username=username).first()
+    if user is None:
+        # tetap hashing supaya timing sama dengan username yang ada
+        hash_password(password)
+        raise HttpError(401, "Invalid username or password")
+    if not user.is_active or not verify_password(user, password):
         raise HttpError(401, "Invalid username or password")
 
-    cache.delete(key)
+    LOGIN_RL_IP.reset(ip)
+    LOGIN_RL_USER.reset(username)
 
     token = create_token(user)  # pastikan token punya exp di auth.py
     return {
@@ -94,17 +131,15 @@ def login(request, username: str, password: str):
 # ======================
 # USERS (ADMIN ONLY) - optional
 # ======================
-@router.get("/users", response=list[UserSchema], auth=JWTAuth())
-def list_users(request):
+@router.get("/users", response=PageSchema, auth=JWTAuth())
+@read_from_replica
+def list_users(request, limit: int = PAGE_DEFAULT_LIMIT,
+               cursor: Optional[str] = None, fields: Optional[str] = None):
     allow_roles("admin")(request)
-    return User.objects.all()
-
-
-# ======================
-# REDIS CACHE (WAJIB UAS) untuk GET /courses
-# ======================
-COURSE_CACHE_KEY = "cache:lms:courses"
-COURSE_CACHE_TTL = 60  # detik
+    return json_response(paginate(
+        User.objects.all(), limit=limit, cursor=cursor, fields=fields,
+        allowed=UserSchema.model_fields,
+    ))
 
 
 # ======================
@@ -112,30 +147,200 @@ COURSE_CACHE_TTL = 60  # detik
 # - GET /courses (protected + RBAC)
 # - POST /courses (protected)
 # - DELETE /courses/{id} (protected)
-# - caching + invalidation
+# - GET /courses/{id}: detail + instructor, lessons, assignments (maks 3 query)
+# - GET /courses/{id}/gradebook: mahasiswa x assignment (gradebook.py), JSON/CSV
+# - caching + invalidation: Redis key versioned per page/filter (cache.py),
+#   invalidasi = bump generation lewat signal Course (signals.py)
 # ======================
-@router.get("/courses", response=list[CourseSchema], auth=JWTAuth())
-def list_courses(request):
+# include= untuk /courses: relasi yang ikut di-embed per course
+COURSE_INCLUDES = ("lessons", "assignments", "instructor")
+INSTRUCTOR_COLUMNS = ("id", "username", "role")
+LESSON_SUMMARY_COLUMNS = ("id", "title")
+ASSIGNMENT_SUMMARY_COLUMNS = ("id", "title", "deadline")
+
+
+def parse_include(include: Optional[str]) -> list[str]:
+    names = []
+    for name in (include or "").split(","):
+        name = name.strip()
+        if not name or name in names:
+            continue
+        if name not in COURSE_INCLUDES:
+            raise HttpError(400, f"Unknown include: {name}")
+        names.append(name)
+    return names
+
+
+# relasi satu-ke-banyak yang bisa di-embed: (key, model, kolom, urutan)
+COURSE_CHILDREN = (
+    ("lessons", Lesson, LESSON_SUMMARY_COLUMNS, "id"),
+    ("assignments", Assignment, ASSIGNMENT_SUMMARY_COLUMNS, "deadline"),
+)
+
+
+def course_list_params(*, limit, cursor, fields, instructor_id, include):
+    """
+    Params cache/ETag /courses, dipakai endpoint sync & async supaya keduanya
+    berbagi entry cache dan ETag yang sama. Return (params, includes).
+    """
+    includes = parse_include(include)
+    params = {
+        "limit": limit, "cursor": cursor, "fields": fields,
+        "instructor_id": instructor_id, "include": ",".join(includes),
+    }
+    return params, includes
+
+
+def course_list_queryset(instructor_id):
+    qs = Course.objects.all()
+    if instructor_id is not None:
+        qs = qs.filter(instructor_id=instructor_id)
+    return qs
+
+
+def _instructor_extra(include):
+    # instructor ikut di query page lewat JOIN (select_related versi .values())
+    return [f"instructor__{c}" for c in INSTRUCTOR_COLUMNS] if "instructor" in include else []
+
+
+def _nest_instructor(rows, include):
+    if "instructor" in include:
+        for row in rows:
+            row["instructor"] = {c: row.pop(f"instructor__{c}") for c in INSTRUCTOR_COLUMNS}
+
+
+def _children_queryset(rows, model, columns, order_by):
+    # satu query IN (...) per relasi untuk seluruh page, sama seperti Prefetch
+    return (
+        model.objects.filter(course_id__in=[row["id"] for row in rows])
+        .order_by(order_by)
+        .values("course_id", *columns)
+    )
+
+
+def _attach_children(rows, key, children):
+    grouped = {row["id"]: [] for row in rows}
+    for child in children:
+        grouped[child.pop("course_id")].append(child)
+    for row in rows:
+        row[key] = grouped[row["id"]]
+
+
+def course_page(qs, *, limit, cursor, fields, include):
+    page = paginate(
+        qs, limit=limit, cursor=cursor, fields=fields,
+        allowed=CourseSchema.model_fields, descending=True, extra=_instructor_extra(include),
+    )
+    rows = page["items"]
+    _nest_instructor(rows, include)
+    for key, model, columns, order_by in COURSE_CHILDREN:
+        if rows and key in include:
+            _attach_children(rows, key, _children_queryset(rows, model, columns, order_by))
+    return page
+
+
+async def acourse_page(qs, *, limit, cursor, fields, include):
+    page = await apaginate(
+        qs, limit=limit, cursor=cursor, fields=fields,
+        allowed=CourseSchema.model_fields, descending=True, extra=_instructor_extra(include),
+    )
+    rows = page["items"]
+    _nest_instructor(rows, include)
+    for key, model, columns, order_by in COURSE_CHILDREN:
+        if rows and key in include:
+            children = _children_queryset(rows, model, columns, order_by)
+            _attach_children(rows, key, [child async for child in children])
+    return page
+
+
+@router.get("/courses", response=PageSchema, auth=JWTAuth())
+def list_courses(request, limit: int = PAGE_DEFAULT_LIMIT,
+                 cursor: Optional[str] = None, fields: Optional[str] = None,
+                 instructor_id: Optional[int] = None, include: Optional[str] = None):
     # Mahasiswa hanya GET course, admin/dosen juga boleh GET
     allow_roles("admin", "dosen", "mahasiswa")(request)
+    params, includes = course_list_params(
+        limit=limit, cursor=cursor, fields=fields, instructor_id=instructor_id, include=include,
+    )
+
+    def build():
+        # terbaru dulu: cursor berjalan turun pada id
+        return course_page(
+            course_list_queryset(instructor_id), limit=limit, cursor=cursor,
+            fields=fields, include=includes,
+        )
+
+    # ETag = generation + params: client yang masih punya versi terbaru
+    # langsung dapat 304 tanpa DB, schema, maupun JSON encoder
+    return cached_json_response(request, COURSE_CACHE_KEY, params, build, COURSE_CACHE_TTL)
+
 
-    cached = cache.get(COURSE_CACHE_KEY)
-    if cached is not None:
-        return cached
-
-    qs = Course.objects.all().order_by("-id")
-    data = [
-        {
-            "id": c.id,
-            "title": c.title,
-            "description": c.description,
-            "instructor_id": c.instructor_id,
-            "created_at": c.created_at,
-        }
-        for c in qs
-    ]
-    cache.set(COURSE_CACHE_KEY, data, COURSE_CACHE_TTL)
-    return data
+@router.get("/courses/{course_id}", response=CourseDetailSchema, auth=JWTAuth())
+def get_course(request, course_id: int):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+
+    def build():
+        # 3 query: course + instructor (JOIN), lessons, assignments
+        qs = (
+            Course.objects.select_related("instructor")
+            .only(
+                *CourseSchema.model_fields,
+                *(f"instructor__{c}" for c in INSTRUCTOR_COLUMNS),
+            )
+            .prefetch_related(
+                Prefetch(
+                    "lessons",
+                    Lesson.objects.only("id", "title", "course_id").order_by("id"),
+                ),
+                Prefetch(
+                    "assignments",
+                    Assignment.objects.only("id", "title", "deadline", "course_id")
+                    .order_by("deadline"),
+                ),
+            )
+        )
+        course = get_object_or_404(qs, id=course_id)
+        return CourseDetailSchema.from_orm(course).model_dump()
+
+    return cached_json_response(
+        request, COURSE_CACHE_KEY, {"detail": course_id}, build, COURSE_CACHE_TTL
+    )
+
+
+@router.get("/courses/{course_id}/gradebook", auth=JWTAuth())
+def course_gradebook(request, course_id: int, format: str = "json"):
+    """
+    Matriks mahasiswa x assignment. JSON: grades[i][j] = nilai students[i]
+    untuk assignments[j] (null = belum ada nilai). CSV: satu baris per mahasiswa.
+    """
+    allow_roles("admin", "dosen")(request)
+    if format not in GRADEBOOK_FORMATS:
+        raise HttpError(400, "format must be one of: json, csv")
+
+    # RBAC + versi cache dalam satu query kecil
+    course = Course.objects.filter(id=course_id).values("instructor_id", "grade_version").first()
+    if course is None:
+        raise HttpError(404, "Course not found")
+    if request.user.role == "dosen" and course["instructor_id"] != request.user.id:
+        raise HttpError(403, "Forbidden: not the course instructor")
+
+    version = course["grade_version"]
+    etag = f'"{version}-{format}"'
+    if etag_matches(request, etag):
+        record_cache(GRADEBOOK_CACHE_KEY, "not_modified")
+        return not_modified(etag)
+
+    def build():
+        return etag, build_gradebook(course_id).render(format)
+
+    body_etag, body = cached_build(
+        GRADEBOOK_CACHE_KEY, {"course": course_id, "format": format}, build,
+        GRADEBOOK_CACHE_TTL, gen=version,
+    )
+    response = bytes_response(body, GRADEBOOK_FORMATS[format], etag=body_etag)
+    if format == "csv":
+        response["Content-Disposition"] = f'attachment; filename="gradebook-course-{course_id}.csv"'
+    return response
 
 
 @router.post("/courses", response=CourseSchema, auth=JWTAuth())
@@ -149,8 +354,7 @@ def create_course(request, data: CourseCreateSchema):
         instructor=instructor
     )
 
-    # cache invalidation (WAJIB UAS)
-    cache.delete(COURSE_CACHE_KEY)
+    # cache invalidation (WAJIB UAS): post_save Course -> bump generation
     return course
 
 
@@ -161,11 +365,39 @@ def delete_course(request, course_id: int):
     course = get_object_or_404(Course, id=course_id)
     course.delete()
 
-    # cache invalidation (WAJIB UAS)
-    cache.delete(COURSE_CACHE_KEY)
+    # cache invalidation (WAJIB UAS): post_delete Course -> bump generation
     return {"message": "Course deleted"}
 
 
+# ======================
+# SEARCH (courses + lessons)
+# - GET /search?q=: full-text, urut relevansi
+# - GET /search/autocomplete?q=: term terakhir sebagai prefix, judul saja
+# - kind=course|lesson untuk membatasi jenis hasil (search.py)
+# ======================
+def _search_args(kind: Optional[str], limit: int):
+    if kind is not None and kind not in fulltext.SEARCH_MODELS:
+        raise HttpError(400, "kind must be one of: course, lesson")
+    if limit < 1:
+        raise HttpError(400, "limit must be >= 1")
+    return min(limit, fulltext.SEARCH_MAX_LIMIT)
+
+
+@router.get("/search", response=list[SearchHitSchema], auth=JWTAuth())
+@read_from_replica
+def search(request, q: str, kind: Optional[str] = None,
+           limit: int = fulltext.SEARCH_DEFAULT_LIMIT):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    return fulltext.search(q, kind=kind, limit=_search_args(kind, limit))
+
+
+@router.get("/search/autocomplete", response=list[SearchHitSchema], auth=JWTAuth())
+@read_from_replica
+def search_autocomplete(request, q: str, kind: Optional[str] = None, limit: int = 10):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    return fulltext.autocomplete(q, kind=kind, limit=_search_args(kind, limit))
+
+
 # ======================
 # REDIS SESSION TEST (WAJIB UAS)
 # ======================
@@ -178,7 +410,7 @@ def test_session(request):
     request.session["count"] = count
 
     return {
-        "message": "Session stored in Redis (via cache backend).",
+        "message": "Session stored in Redis (write-behind to database).",
         "session_key": request.session.session_key,
         "count": count,
         "user": request.user.username,
@@ -188,10 +420,18 @@ def test_session(request):
 
 # ======================
 # LESSONS (optional untuk UAS, tapi aman dibiarkan)
+# - filter: course_id (filters.py)
 # ======================
-@router.get("/lessons", response=list[LessonSchema])
-def list_lessons(request):
-    return Lesson.objects.all()
+@router.get("/lessons", response=PageSchema, auth=JWTAuth())
+@read_from_replica
+def list_lessons(request, limit: int = PAGE_DEFAULT_LIMIT,
+                 cursor: Optional[str] = None, fields: Optional[str] = None,
+                 course_id: Optional[int] = None):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    return json_response(paginate(
+        lesson_queryset(course_id), limit=limit, cursor=cursor, fields=fields,
+        allowed=LessonSchema.model_fields,
+    ))
 
 
 @router.post("/lessons", response=LessonSchema, auth=JWTAuth())
@@ -206,12 +446,45 @@ def create_lesson(request, data: LessonCreateSchema):
     )
 
 
+def _build_lesson(data: LessonCreateSchema):
+    return Lesson(title=data.title, content=data.content, course_id=data.course_id)
+
+
+@router.post("/lessons/bulk", response=BulkResultSchema, auth=JWTAuth())
+def bulk_create_lessons(request, data: list[Any]):
+    allow_roles("admin", "dosen")(request)
+    # validasi per item: item rusak jadi error baris, bukan 422 seluruh batch
+    rows, errors = validate_rows(data, LessonCreateSchema)
+    return bulk_create_in_courses(Lesson, rows, _build_lesson, errors)
+
+
+@router.post("/lessons/bulk/csv", response=BulkResultSchema, auth=JWTAuth())
+def bulk_import_lessons(request, file: UploadedFile = File(...)):
+    # kolom CSV: title,content,course_id
+    allow_roles("admin", "dosen")(request)
+    rows, errors = read_csv_rows(file, LessonCreateSchema)
+    return bulk_create_in_courses(Lesson, rows, _build_lesson, errors)
+
+
 # ======================
 # ASSIGNMENTS (optional untuk UAS, tapi aman dibiarkan)
+# - filter: course_id, deadline_after (>=), deadline_before (<)
+# - dengan filter deadline, page urut (deadline, id); tanpa itu urut id
 # ======================
-@router.get("/assignments", response=list[AssignmentSchema])
-def list_assignments(request):
-    return Assignment.objects.all()
+@router.get("/assignments", response=PageSchema, auth=JWTAuth())
+@read_from_replica
+def list_assignments(request, limit: int = PAGE_DEFAULT_LIMIT,
+                     cursor: Optional[str] = None, fields: Optional[str] = None,
+                     course_id: Optional[int] = None,
+                     deadline_after: Optional[datetime] = None,
+                     deadline_before: Optional[datetime] = None):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    return json_response(paginate(
+        assignment_queryset(course_id, deadline_after, deadline_before),
+        limit=limit, cursor=cursor, fields=fields,
+        allowed=AssignmentSchema.model_fields,
+        key=assignment_page_key(deadline_after, deadline_before),
+    ))
 
 
 @router.post("/assignments", response=AssignmentSchema, auth=JWTAuth())
@@ -226,31 +499,198 @@ def create_assignment(request, data: AssignmentCreateSchema):
     )
 
 
+def _build_assignment(data: AssignmentCreateSchema):
+    return Assignment(title=data.title, deadline=data.deadline, course_id=data.course_id)
+
+
+@router.post("/assignments/bulk", response=BulkResultSchema, auth=JWTAuth())
+def bulk_create_assignments(request, data: list[Any]):
+    allow_roles("admin", "dosen")(request)
+    rows, errors = validate_rows(data, AssignmentCreateSchema)
+    return bulk_create_in_courses(Assignment, rows, _build_assignment, errors)
+
+
+@router.post("/assignments/bulk/csv", response=BulkResultSchema, auth=JWTAuth())
+def bulk_import_assignments(request, file: UploadedFile = File(...)):
+    # kolom CSV: title,deadline,course_id (deadline ISO 8601)
+    allow_roles("admin", "dosen")(request)
+    rows, errors = read_csv_rows(file, AssignmentCreateSchema)
+    return bulk_create_in_courses(Assignment, rows, _build_assignment, errors)
+
+
+# ======================
+# BULK GRADING - satu request untuk satu assignment
+# ======================
+def _check_grader(request, assignment_id):
+    # RBAC sekali: admin, atau dosen pengampu course dari assignment ini
+    allow_roles("admin", "dosen")(request)
+    instructor_ids = list(
+        Assignment.objects.filter(id=assignment_id)
+        .values_list("course__instructor_id", flat=True)
+    )
+    if not instructor_ids:
+        raise HttpError(404, "Assignment not found")
+    if request.user.role == "dosen" and instructor_ids[0] != request.user.id:
+        raise HttpError(403, "Forbidden: not the course instructor")
+
+
+@router.post("/assignments/{assignment_id}/grades", response=GradeResultSchema, auth=JWTAuth())
+def bulk_grade_submissions(request, assignment_id: int, data: list[GradeSchema]):
+    _check_grader(request, assignment_id)
+    return bulk_grade(assignment_id, list(enumerate(data)))
+
+
+@router.post("/assignments/{assignment_id}/grades/csv", response=GradeResultSchema, auth=JWTAuth())
+def bulk_grade_submissions_csv(request, assignment_id: int, file: UploadedFile = File(...)):
+    # kolom CSV: submission_id,grade (grade kosong = hapus nilai)
+    _check_grader(request, assignment_id)
+    rows, errors = read_csv_rows(file, GradeSchema)
+    return bulk_grade(assignment_id, rows, errors)
+
+
 # ======================
 # SUBMISSIONS (optional untuk UAS, tapi aman)
+# - filter: assignment_id, student_id, course_id, graded=true|false
 # ======================
-@router.get("/submissions", response=list[SubmissionSchema], auth=JWTAuth())
-def list_submissions(request):
+@router.get("/submissions", response=PageSchema, auth=JWTAuth())
+@read_from_replica
+def list_submissions(request, limit: int = PAGE_DEFAULT_LIMIT,
+                     cursor: Optional[str] = None, fields: Optional[str] = None,
+                     assignment_id: Optional[int] = None,
+                     student_id: Optional[int] = None,
+                     course_id: Optional[int] = None,
+                     graded: Optional[bool] = None):
+    # mahasiswa boleh, tapi otomatis dibatasi ke submission miliknya
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    qs = submission_queryset(request.user, assignment_id, student_id, course_id, graded)
+    return json_response(with_file_urls(paginate(
+        qs, limit=limit, cursor=cursor, fields=fields,
+        allowed=SubmissionSchema.model_fields,
+    )))
+
+
+# Export untuk grading offline: di-stream per baris, memori tetap datar
+SUBMISSION_EXPORT_COLUMNS = (
+    "id", "assignment_id", "student_id", "student__username", "answer", "file", "grade",
+)
+
+
+@router.get("/submissions/export", auth=JWTAuth())
+@read_from_replica
+def export_submissions(request, format: str = "ndjson",
+                       assignment_id: Optional[int] = None,
+                       student_id: Optional[int] = None,
+                       course_id: Optional[int] = None,
+                       graded: Optional[bool] = None):
     allow_roles("admin", "dosen")(request)
-    return Submission.objects.all()
+    if format not in EXPORT_CONTENT_TYPES:
+        raise HttpError(400, "format must be one of: ndjson, csv")
+
+    qs = submission_queryset(
+        request.user, assignment_id, student_id, course_id, graded
+    ).order_by("id")
+
+    # file dikirim sebagai URL download terproteksi, bukan path storage
+    return stream_queryset(
+        qs, SUBMISSION_EXPORT_COLUMNS, format, "submissions", transform=file_url_rows
+    )
+
+
+@router.get("/submissions/{submission_id}/file", auth=JWTAuth(), url_name="submission_file")
+def download_submission_file(request, submission_id: int):
+    # boleh: mahasiswa pemilik, admin, dosen pengampu course assignment-nya
+    submission = get_object_or_404(
+        Submission.objects.select_related("assignment__course").only(
+            "id", "file", "student_id", "assignment__course__instructor_id",
+        ),
+        id=submission_id,
+    )
+    user = request.user
+    allowed = (
+        user.role == "admin"
+        or (user.role == "mahasiswa" and submission.student_id == user.id)
+        or (user.role == "dosen" and submission.assignment.course.instructor_id == user.id)
+    )
+    if not allowed:
+        raise HttpError(403, "Forbidden")
+
+    ext = os.path.splitext(submission.file.name)[1]
+    return serve_file(request, submission.file, filename=f"submission-{submission.id}{ext}")
 
 
 @router.post("/submissions", response=SubmissionSchema, auth=JWTAuth())
+@rate_limit("submission", SUBMISSION_RATE, key="user")
 def create_submission(request, data: SubmissionCreateSchema):
     allow_roles("mahasiswa")(request)
 
     student = get_object_or_404(User, id=data.student_id)
     assignment = get_object_or_404(Assignment, id=data.assignment_id)
 
-    submission = Submission.objects.create(
-        answer=data.answer,
-        student=student,
-        assignment=assignment
+    try:
+        with transaction.atomic():
+            submission = Submission.objects.create(
+                answer=data.answer,
+                student=student,
+                assignment=assignment
+            )
+    except IntegrityError:
+        # unique (assignment, student): satu submission per mahasiswa
+        raise HttpError(409, "Submission already exists for this assignment")
+
+    # file hanya bisa dipasang lewat POST /uploads/{id}/finalize
+    return submission
+
+
+# ======================
+# SUBMISSION FILE UPLOAD (chunked + resumable, lihat uploads.py)
+# 1. POST /submissions/{id}/uploads {filename, size, sha256?} -> upload_id
+# 2. PUT /uploads/{upload_id}?offset=N  body = byte mentah chunk
+#    (putus? GET /uploads/{upload_id} untuk offset terakhir, lalu lanjut)
+# 3. POST /uploads/{upload_id}/finalize -> file terpasang di Submission
+# ======================
+@router.post("/submissions/{submission_id}/uploads", response=UploadStatusSchema, auth=JWTAuth())
+def start_submission_upload(request, submission_id: int, data: UploadCreateSchema):
+    allow_roles("mahasiswa")(request)
+    submission = get_object_or_404(
+        Submission.objects.only("id"), id=submission_id, student_id=request.user.id
     )
+    return uploads.start_upload(submission, request.user, data.filename, data.size, data.sha256)
+
+
+@router.get("/uploads/{upload_id}", response=UploadStatusSchema, auth=JWTAuth())
+def get_upload(request, upload_id: str):
+    allow_roles("mahasiswa")(request)
+    return uploads.upload_status(upload_id, request.user)
 
-    # kalau kamu ingin isi field file lewat path (opsional)
-    if getattr(data, "file", None):
-        submission.file = data.file  # biasanya untuk upload harus pakai endpoint upload, tapi ini opsional
-        submission.save()
 
+@router.put("/uploads/{upload_id}", response=UploadStatusSchema, auth=JWTAuth())
+def put_upload_chunk(request, upload_id: str, offset: int):
+    allow_roles("mahasiswa")(request)
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if not length:
+        raise HttpError(411, "Content-Length required")
+    # request dibaca sebagai stream, tidak pernah lewat request.body
+    return uploads.write_chunk(upload_id, request.user, offset, request, length)
+
+
+@router.post("/uploads/{upload_id}/finalize", response=SubmissionSchema, auth=JWTAuth())
+def finalize_upload(request, upload_id: str):
+    allow_roles("mahasiswa")(request)
+    meta, name = uploads.finalize_upload(upload_id, request.user)
+    submission = get_object_or_404(
+        Submission, id=meta["submission_id"], student_id=request.user.id
+    )
+    # file lama tidak dihapus: path dedup bisa dipakai submission lain
+    submission.file.name = name
+    submission.save(update_fields=["file"])
     return submission
+
+
+@router.delete("/uploads/{upload_id}", auth=JWTAuth())
+def abort_upload(request, upload_id: str):
+    allow_roles("mahasiswa")(request)
+    uploads.abort_upload(upload_id, request.user)
+    return {"message": "Upload aborted"}
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional
+
+from ninja import Router
+
+from .schemas import (
+    LessonSchema, AssignmentSchema, SubmissionSchema, PageSchema,
+)
+from .auth import AsyncJWTAuth
+from .api import acourse_page, allow_roles, course_list_params, course_list_queryset
+from .cache import (
+    COURSE_CACHE_KEY, COURSE_CACHE_TTL, acached_build, ageneration, params_digest,
+)
+from .http import dump_json, etag_matches, json_bytes_response, json_response, not_modified
+from .metrics import record_cache
+from .db_router import read_from_replica
+from .downloads import with_file_urls
+from .filters import (
+    assignment_page_key, assignment_queryset, lesson_queryset, submission_queryset,
+)
+from .pagination import PAGE_DEFAULT_LIMIT, apaginate
+
+# ======================
+# ASYNC (ASGI) VARIANTS - dipasang di /api/lms/async/...
+# Perilaku & format response sama dengan versi sync di api.py; bedanya
+# query lewat async ORM dan cache hit L1 dijawab tanpa pindah thread.
+# ======================
+router = Router()
+
+
+@router.get("/courses", response=PageSchema, auth=AsyncJWTAuth())
+async def list_courses(request, limit: int = PAGE_DEFAULT_LIMIT,
+                       cursor: Optional[str] = None, fields: Optional[str] = None,
+                       instructor_id: Optional[int] = None, include: Optional[str] = None):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    # params sama persis dengan versi sync: entry cache & ETag dipakai bersama
+    params, includes = course_list_params(
+        limit=limit, cursor=cursor, fields=fields, instructor_id=instructor_id, include=include,
+    )
+    gen = await ageneration(COURSE_CACHE_KEY)
+    etag = f'"{gen}-{params_digest(params)}"'
+    if etag_matches(request, etag):
+        record_cache(COURSE_CACHE_KEY, "not_modified")
+        return not_modified(etag)
+
+    async def build():
+        page = await acourse_page(
+            course_list_queryset(instructor_id), limit=limit, cursor=cursor,
+            fields=fields, include=includes,
+        )
+        return etag, dump_json(page)
+
+    body_etag, body = await acached_build(
+        COURSE_CACHE_KEY, params, build, COURSE_CACHE_TTL, gen=gen
+    )
+    return json_bytes_response(body, etag=body_etag)
+
+
+@router.get("/lessons", response=PageSchema, auth=AsyncJWTAuth())
+@read_from_replica
+async def list_lessons(request, limit: int = PAGE_DEFAULT_LIMIT,
+                       cursor: Optional[str] = None, fields: Optional[str] = None,
+                       course_id: Optional[int] = None):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    return json_response(await apaginate(
+        lesson_queryset(course_id), limit=limit, cursor=cursor, fields=fields,
+        allowed=LessonSchema.model_fields,
+    ))
+
+
+@router.get("/assignments", response=PageSchema, auth=AsyncJWTAuth())
+@read_from_replica
+async def list_assignments(request, limit: int = PAGE_DEFAULT_LIMIT,
+                           cursor: Optional[str] = None, fields: Optional[str] = None,
+                           course_id: Optional[int] = None,
+                           deadline_after: Optional[datetime] = None,
+                           deadline_before: Optional[datetime] = None):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    return json_response(await apaginate(
+        assignment_queryset(course_id, deadline_after, deadline_before),
+        limit=limit, cursor=cursor, fields=fields,
+        allowed=AssignmentSchema.model_fields,
+        key=assignment_page_key(deadline_after, deadline_before),
+    ))
+
+
+@router.get("/submissions", response=PageSchema, auth=AsyncJWTAuth())
+@read_from_replica
+async def list_submissions(request, limit: int = PAGE_DEFAULT_LIMIT,
+                           cursor: Optional[str] = None, fields: Optional[str] = None,
+                           assignment_id: Optional[int] = None,
+                           student_id: Optional[int] = None,
+                           course_id: Optional[int] = None,
+                           graded: Optional[bool] = None):
+    allow_roles("admin", "dosen", "mahasiswa")(request)
+    qs = submission_queryset(request.user, assignment_id, student_id, course_id, graded)
+    return json_response(with_file_urls(await apaginate(
+        qs, limit=limit, cursor=cursor, fields=fields,
+        allowed=SubmissionSchema.model_fields,
+    )))
@@ -1,14 +1,72 @@
 import jwt
+import logging
 from datetime import datetime, timedelta, timezone
 from django.conf import settings
 from ninja.security import HttpBearer
 from ninja.errors import HttpError
+from .cache import ageneration, bump_generation, generation
+from .lru import TTLCache
 from .models import User
 
+logger = logging.getLogger(__name__)
+
 JWT_SECRET = settings.SECRET_KEY
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = 60
 
+# True: percaya claim role/username di token (0 query DB per request).
+# False: principal diambil dari DB lewat cache per-process (TTL pendek).
+JWT_TRUST_CLAIMS = getattr(settings, "LMS_JWT_TRUST_CLAIMS", False)
+
+# ======================
+# TOKEN VERSION (revocation)
+# Versi per user di Redis (generation cache.py), ikut di claim "ver". User
+# disimpan (role berubah, dinonaktifkan, ganti password) atau dihapus ->
+# versi naik (signals.py): semua token lamanya langsung 401 di semua worker,
+# dan cache principal per-worker ikut basi karena key-nya memuat versi.
+# Biaya: tepat satu GET Redis per request terautentikasi (key auth:user:* tidak
+# masuk L1 supaya revoke langsung berlaku), tetap tanpa query DB.
+# Redis error -> pakai versi terakhir yang terbaca di worker ini, maksimal
+# LMS_TOKEN_VERSION_FALLBACK_TTL detik (revoke selama Redis mati baru berlaku
+# setelah Redis pulih); tidak ada salinan -> 503, bukan 500. TTL 0 = fail closed.
+# ======================
+USER_VERSION_KEY = "auth:user"
+
+version_fallback = TTLCache(
+    maxsize=getattr(settings, "LMS_USER_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "LMS_TOKEN_VERSION_FALLBACK_TTL", 30),
+)
+
+
+def _version_unavailable(user_id):
+    logger.warning("Token version lookup failed for user %s", user_id, exc_info=True)
+    version = version_fallback.get(user_id)
+    if version is None:
+        raise HttpError(503, "Authentication temporarily unavailable")
+    return version
+
+
+def token_version(user_id) -> int:
+    try:
+        version = generation(f"{USER_VERSION_KEY}:{user_id}")
+    except Exception:
+        return _version_unavailable(user_id)
+    version_fallback.set(user_id, version)
+    return version
+
+
+async def atoken_version(user_id) -> int:
+    try:
+        version = await ageneration(f"{USER_VERSION_KEY}:{user_id}")
+    except Exception:
+        return _version_unavailable(user_id)
+    version_fallback.set(user_id, version)
+    return version
+
+
+def revoke_tokens(user_id):
+    bump_generation(f"{USER_VERSION_KEY}:{user_id}")
+
 
 def create_token(user: User):
     now = datetime.now(timezone.utc)
@@ -16,23 +74,142 @@ def create_token(user: User):
         "user_id": user.id,
         "username": user.username,
         "role": user.role,
+        "ver": token_version(user.id),
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(minutes=JWT_EXPIRE_MINUTES)).timestamp()),
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+class TokenUser:
+    """Principal ringan pengganti instance User untuk request API."""
+
+    __slots__ = ("id", "username", "role")
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __str__(self):
+        return f"{self.username} ({self.role})"
+
+
+# cache principal per worker, key (user_id, versi): versi naik -> entry lama
+# tidak terbaca lagi di worker mana pun
+user_cache = TTLCache(
+    maxsize=getattr(settings, "LMS_USER_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "LMS_USER_CACHE_TTL", 30),
+)
+
+
+def get_principal(user_id, version=None):
+    principal = user_cache.get((user_id, version))
+    if principal is not None:
+        return principal
+
+    # user nonaktif tidak boleh lagi memakai token lamanya
+    row = (
+        User.objects.filter(id=user_id, is_active=True)
+        .values_list("id", "username", "role")
+        .first()
+    )
+    if row is None:
+        return None
+
+    principal = TokenUser(*row)
+    user_cache.set((user_id, version), principal)
+    return principal
+
+
+async def aget_principal(user_id, version=None):
+    principal = user_cache.get((user_id, version))
+    if principal is not None:
+        return principal
+
+    row = await (
+        User.objects.filter(id=user_id, is_active=True)
+        .values_list("id", "username", "role")
+        .afirst()
+    )
+    if row is None:
+        return None
+
+    principal = TokenUser(*row)
+    user_cache.set((user_id, version), principal)
+    return principal
+
+
+def _decode(token):
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        # ✅ WAJIB UAS: token expired tidak bisa dipakai
+        raise HttpError(401, "Token expired")
+    except jwt.InvalidTokenError:
+        raise HttpError(401, "Invalid token")
+
+
+def _check_version(payload, current):
+    # token tanpa "ver" (dibuat sebelum revocation ada) juga ditolak: login ulang
+    if payload.get("ver") != current:
+        raise HttpError(401, "Token revoked")
+
+
+def _claims_principal(payload):
+    try:
+        return TokenUser(payload["user_id"], payload["username"], payload["role"])
+    except KeyError:
+        raise HttpError(401, "Invalid token")
+
+
 class JWTAuth(HttpBearer):
+    def __init__(self, trust_claims=None):
+        self.trust_claims = JWT_TRUST_CLAIMS if trust_claims is None else trust_claims
+        super().__init__()
+
     def authenticate(self, request, token):
-        try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-            user = User.objects.get(id=payload["user_id"])
-            request.user = user
-            return user
+        payload = _decode(token)
+        if "user_id" not in payload:
+            raise HttpError(401, "Invalid token")
+        version = token_version(payload["user_id"])
+        _check_version(payload, version)
+        if self.trust_claims:
+            user = _claims_principal(payload)
+        else:
+            user = get_principal(payload["user_id"], version)
+
+        if user is None:
+            raise HttpError(401, "Invalid token")
 
-        except jwt.ExpiredSignatureError:
-            # ✅ WAJIB UAS: token expired tidak bisa dipakai
-            raise HttpError(401, "Token expired")
+        request.user = user
+        return user
 
-        except (jwt.InvalidTokenError, User.DoesNotExist, KeyError):
+
+class AsyncJWTAuth(JWTAuth):
+    """JWTAuth untuk endpoint async (ASGI): lookup principal lewat async ORM."""
+
+    async def authenticate(self, request, token):
+        payload = _decode(token)
+        if "user_id" not in payload:
             raise HttpError(401, "Invalid token")
+        version = await atoken_version(payload["user_id"])
+        _check_version(payload, version)
+        if self.trust_claims:
+            user = _claims_principal(payload)
+        else:
+            user = await aget_principal(payload["user_id"], version)
+
+        if user is None:
+            raise HttpError(401, "Invalid token")
+
+        request.user = user
+        return user
@@ -0,0 +1,193 @@
+import csv
+import io
+from collections import Counter
+
+from django.db import transaction
+from ninja.errors import HttpError
+from pydantic import ValidationError
+
+from . import counters
+from .cache import invalidate_course_cache
+from .models import Course, Submission
+from .search import index_objects
+
+# ======================
+# BULK IMPORT (lessons / assignments)
+# ======================
+BULK_BATCH_SIZE = 500
+BULK_MAX_ROWS = 10000
+
+
+def _validation_message(exc: ValidationError) -> str:
+    err = exc.errors()[0]
+    field = ".".join(str(p) for p in err["loc"])
+    return f"{field}: {err['msg']}" if field else err["msg"]
+
+
+def _optional_fields(schema):
+    return {name for name, f in schema.model_fields.items() if not f.is_required()}
+
+
+def _validate_row(row, raw, schema, rows, errors, optional=frozenset()):
+    """Validasi satu baris ke `schema`: hasilnya masuk `rows` atau `errors`."""
+    if not isinstance(raw, dict):
+        errors.append({"row": row, "error": "row must be an object"})
+        return
+    # sel kosong pada field opsional = pakai default schema (mis. grade None)
+    raw = {k: v for k, v in raw.items() if not (v == "" and k in optional)}
+    try:
+        rows.append((row, schema.model_validate(raw)))
+    except ValidationError as exc:
+        errors.append({"row": row, "error": _validation_message(exc)})
+
+
+def validate_rows(items, schema):
+    """
+    Body JSON list -> ([(row, obj)], errors) dengan row = index di list.
+    Satu item invalid tidak menggagalkan seluruh batch (bukan 422).
+    """
+    if len(items) > BULK_MAX_ROWS:
+        raise HttpError(400, f"Too many rows (max {BULK_MAX_ROWS})")
+    rows, errors = [], []
+    for row, raw in enumerate(items):
+        _validate_row(row, raw, schema, rows, errors)
+    return rows, errors
+
+
+def read_csv_rows(upload, schema):
+    """
+    Baca CSV upload baris per baris -> ([(row, obj)], errors).
+    `row` = nomor baris di file (header = baris 1). File bukan UTF-8, CSV
+    rusak, atau kolom header di luar schema -> 400 untuk seluruh file.
+    """
+    rows, errors = [], []
+    optional = _optional_fields(schema)
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    try:
+        if not reader.fieldnames:
+            raise HttpError(400, "CSV header row is missing")
+        unknown = [name for name in reader.fieldnames if name not in schema.model_fields]
+        if unknown:
+            raise HttpError(400, f"Unknown CSV columns: {', '.join(unknown)}")
+        for line, raw in enumerate(reader, start=2):
+            if len(rows) + len(errors) >= BULK_MAX_ROWS:
+                raise HttpError(400, f"Too many rows (max {BULK_MAX_ROWS})")
+            if None in raw:
+                # sel lebih banyak dari header
+                errors.append({"row": line, "error": "more values than header columns"})
+                continue
+            _validate_row(line, raw, schema, rows, errors, optional)
+    except UnicodeDecodeError:
+        raise HttpError(400, "CSV must be UTF-8 encoded")
+    except csv.Error as exc:
+        raise HttpError(400, f"Invalid CSV: {exc}")
+    finally:
+        # jangan ikut menutup file upload milik request
+        text.detach()
+    return rows, errors
+
+
+def bulk_create_in_courses(model, rows, build, errors=None):
+    """
+    rows: [(row, schema obj dengan course_id)]. Semua course_id divalidasi
+    dengan satu query in_bulk, baris valid di-INSERT per batch dalam satu
+    transaksi, baris invalid dikembalikan sebagai error per baris.
+    """
+    errors = list(errors or [])
+    if len(rows) > BULK_MAX_ROWS:
+        raise HttpError(400, f"Too many rows (max {BULK_MAX_ROWS})")
+
+    courses = Course.objects.only("id").in_bulk({obj.course_id for _, obj in rows})
+
+    objs = []
+    for row, obj in rows:
+        if obj.course_id not in courses:
+            errors.append({"row": row, "error": f"course_id {obj.course_id} not found"})
+            continue
+        objs.append(build(obj))
+
+    with transaction.atomic():
+        created = model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+        if created:
+            # bulk_create tidak memicu signal: index search, counter course &
+            # invalidasi cache manual
+            index_objects(model, created)
+            counters.bump_course(model, Counter(o.course_id for o in created))
+            transaction.on_commit(invalidate_course_cache)
+
+    errors.sort(key=lambda e: e["row"])
+    return {"created": len(created), "ids": [o.pk for o in created], "errors": errors}
+
+
+# ======================
+# BULK GRADING (submissions satu assignment)
+# ======================
+GRADE_MIN = 0
+GRADE_MAX = 100
+
+
+def bulk_grade(assignment_id, rows, errors=None):
+    """
+    rows: [(row, GradeSchema)]. Submission di luar assignment ini dilaporkan
+    not found; sisanya di-UPDATE lewat bulk_update(["grade"]) per batch.
+    """
+    results = [
+        {"row": e["row"], "submission_id": None, "status": "invalid", "error": e["error"]}
+        for e in (errors or [])
+    ]
+    if len(rows) > BULK_MAX_ROWS:
+        raise HttpError(400, f"Too many rows (max {BULK_MAX_ROWS})")
+
+    valid = []
+    for row, item in rows:
+        if item.grade is not None and not GRADE_MIN <= item.grade <= GRADE_MAX:
+            results.append({
+                "row": row, "submission_id": item.submission_id, "status": "invalid",
+                "error": f"grade must be between {GRADE_MIN} and {GRADE_MAX}",
+            })
+            continue
+        valid.append((row, item))
+
+    with transaction.atomic():
+        # satu query; submission milik assignment lain otomatis tidak ketemu.
+        # Grade lama (dasar delta agregat) dibaca dengan row lock sampai commit:
+        # regrade lain di tengah jalan menunggu, agregat tidak drift. Urut pk
+        # supaya dua bulk job yang beririsan mengunci dengan urutan yang sama.
+        locked = (
+            Submission.objects.select_for_update()
+            .filter(assignment_id=assignment_id, pk__in={item.submission_id for _, item in valid})
+            .only("id", "grade")
+            .order_by("pk")
+        )
+        submissions = {s.pk: s for s in locked}
+        original = {pk: s.grade for pk, s in submissions.items()}
+
+        changed = {}
+        graded = grade_sum = 0
+        for row, item in valid:
+            submission = submissions.get(item.submission_id)
+            if submission is None:
+                results.append({
+                    "row": row, "submission_id": item.submission_id, "status": "not_found",
+                    "error": "submission not found in this assignment",
+                })
+                continue
+            # delta dihitung per baris: submission yang sama bisa muncul dua kali
+            delta_graded, delta_sum = counters.grade_delta(submission.grade, item.grade)
+            graded += delta_graded
+            grade_sum += delta_sum
+            submission.grade = item.grade
+            changed[submission.pk] = submission
+            results.append({"row": row, "submission_id": item.submission_id, "status": "updated", "error": None})
+
+        Submission.objects.bulk_update(changed.values(), ["grade"], batch_size=BULK_BATCH_SIZE)
+        # bulk_update juga tanpa signal: agregat assignment di-update sekali;
+        # nilai yang hanya bertukar (delta bersih 0) tetap invalidasi gradebook
+        regraded = any(s.grade != original[pk] for pk, s in changed.items())
+        counters.bump_assignment(
+            assignment_id, graded=graded, grade_sum=grade_sum, regraded=regraded
+        )
+
+    results.sort(key=lambda r: r["row"])
+    return {"updated": len(changed), "results": results}
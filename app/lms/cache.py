@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import math
+import random
+import time
+
+from django.core.cache import cache
+
+from .metrics import record_cache
+
+# ======================
+# VERSIONED CACHE + STAMPEDE PROTECTION
+# ======================
+# Key data: "<name>:v<generation>:<digest params>". Invalidasi = INCR generation,
+# key lama tidak dihapus, cukup tidak dibaca lagi dan expire sendiri.
+COURSE_CACHE_KEY = "cache:lms:courses"
+COURSE_CACHE_TTL = 60  # detik
+
+CACHE_STALE_GRACE = 300   # entry basi masih boleh dilayani selama rebuild
+CACHE_LOCK_TTL = 10       # single-flight lock, jaga-jaga kalau builder crash
+CACHE_LOCK_WAIT = 0.05
+CACHE_LOCK_RETRIES = 10
+XFETCH_BETA = 1.0         # >1 = recompute lebih awal
+
+
+def _generation_key(name):
+    return f"{name}:gen"
+
+
+def _seed_generation() -> int:
+    # mulai dari timestamp (mikrodetik) supaya generation lama tidak pernah
+    # terpakai ulang kalau key generation ter-evict dari Redis: seed baru selalu
+    # di atas seed lama + jumlah bump, selama bump < 1 juta per detik
+    return time.time_ns() // 1000
+
+
+def generation(name) -> int:
+    key = _generation_key(name)
+    gen = cache.get(key)
+    if gen is None:
+        cache.add(key, _seed_generation(), None)
+        gen = cache.get(key)
+    return gen
+
+
+async def ageneration(name) -> int:
+    key = _generation_key(name)
+    gen = await cache.aget(key)
+    if gen is None:
+        await cache.aadd(key, _seed_generation(), None)
+        gen = await cache.aget(key)
+    return gen
+
+
+def bump_generation(name) -> int:
+    key = _generation_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed_generation(), None)
+        return cache.incr(key)
+
+
+def invalidate_course_cache():
+    return bump_generation(COURSE_CACHE_KEY)
+
+
+def params_digest(params: dict) -> str:
+    raw = "&".join(f"{k}={params[k]}" for k in sorted(params))
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
+
+
+def _should_recompute(entry, now) -> bool:
+    # probabilistic early recomputation (XFetch): makin dekat expiry dan makin
+    # mahal build-nya, makin besar peluang satu request me-refresh lebih awal
+    expires, delta, _ = entry
+    return now - delta * XFETCH_BETA * math.log(random.random() or 1e-12) >= expires
+
+
+def _entry_keys(name, gen, params):
+    digest = params_digest(params)
+    # last_key = entry terakhir lintas generation (untuk stale-while-revalidate)
+    return f"{name}:v{gen}:{digest}", f"{name}:last:{digest}"
+
+
+def cached_build(name, params: dict, build, ttl: int, gen=None):
+    """
+    Ambil hasil `build()` dari cache versioned. Saat miss/expired hanya satu
+    worker yang rebuild (lock via cache.add); worker lain melayani entry basi
+    (stale-while-revalidate) atau menunggu sebentar kalau belum ada sama sekali.
+    `gen` bisa diisi caller yang sudah membaca generation (mis. untuk ETag).
+    """
+    if gen is None:
+        gen = generation(name)
+    key, last_key = _entry_keys(name, gen, params)
+
+    entry = cache.get(key)
+    if entry is not None and not _should_recompute(entry, time.time()):
+        record_cache(name, "hit")
+        return entry[2]
+
+    stale = entry if entry is not None else cache.get(last_key)
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, CACHE_LOCK_TTL):
+        record_cache(name, "miss")
+        try:
+            started = time.time()
+            value = build()
+            finished = time.time()
+            fresh = (finished + ttl, finished - started, value)
+            cache.set_many({key: fresh, last_key: fresh}, ttl + CACHE_STALE_GRACE)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    if stale is not None:
+        record_cache(name, "stale")
+        return stale[2]
+
+    for _ in range(CACHE_LOCK_RETRIES):
+        time.sleep(CACHE_LOCK_WAIT)
+        entry = cache.get(key)
+        if entry is not None:
+            record_cache(name, "wait")
+            return entry[2]
+    record_cache(name, "miss")
+    return build()
+
+
+async def acached_build(name, params: dict, abuild, ttl: int, gen=None):
+    """Versi async dari cached_build(); `abuild` adalah coroutine function."""
+    if gen is None:
+        gen = await ageneration(name)
+    key, last_key = _entry_keys(name, gen, params)
+
+    entry = await cache.aget(key)
+    if entry is not None and not _should_recompute(entry, time.time()):
+        record_cache(name, "hit")
+        return entry[2]
+
+    stale = entry if entry is not None else await cache.aget(last_key)
+
+    lock_key = f"{key}:lock"
+    if await cache.aadd(lock_key, 1, CACHE_LOCK_TTL):
+        record_cache(name, "miss")
+        try:
+            started = time.time()
+            value = await abuild()
+            finished = time.time()
+            fresh = (finished + ttl, finished - started, value)
+            await cache.aset_many({key: fresh, last_key: fresh}, ttl + CACHE_STALE_GRACE)
+        finally:
+            await cache.adelete(lock_key)
+        return value
+
+    if stale is not None:
+        record_cache(name, "stale")
+        return stale[2]
+
+    for _ in range(CACHE_LOCK_RETRIES):
+        await asyncio.sleep(CACHE_LOCK_WAIT)
+        entry = await cache.aget(key)
+        if entry is not None:
+            record_cache(name, "wait")
+            return entry[2]
+    record_cache(name, "miss")
+    return await abuild()
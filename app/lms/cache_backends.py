@@ -0,0 +1,308 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+from .lru import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _SharedL1:
+    """
+    State L1 per process. Django membuat instance cache per thread, jadi L1 &
+    thread listener disimpan di sini supaya semua thread worker berbagi satu
+    LRU dan satu koneksi pub/sub.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.listener_pid = None
+        self.lock = threading.Lock()
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_l1(key, maxsize, ttl):
+    with _shared_lock:
+        state = _shared.get(key)
+        if state is None:
+            state = _shared[key] = _SharedL1(maxsize, ttl)
+        return state
+
+
+# redis.asyncio client per event loop (koneksi asyncio terikat ke loop-nya),
+# dibagi semua instance cache: di ASGI Django membuat instance backend baru
+# per async context, jadi client di instance = satu pool baru per request.
+# loop -> {url: (client, closer)}; entry hilang sendiri saat loop di-GC.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+async def _close_with_loop(client):
+    # asyncio.run() (uvicorn, asgiref) memanggil loop.shutdown_asyncgens()
+    # sebelum loop ditutup: finally ini jalan di loop yang masih hidup
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def _async_client(url, connection_class=None):
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    entry = clients.get(url)
+    if entry is None:
+        import redis.asyncio
+        kwargs = {"connection_class": connection_class} if connection_class else {}
+        client = redis.asyncio.Redis.from_url(url, **kwargs)
+        closer = _close_with_loop(client)
+        await closer.__anext__()
+        entry = clients[url] = (client, closer)
+    return entry[0]
+
+
+class TwoTierCache(BaseCache):
+    """
+    L1 = LRU in-process (objek yang sudah di-unpickle, TTL pendek),
+    L2 = cache alias lain (django_redis).
+
+    Hanya key dengan prefix di OPTIONS["L1_KEY_PREFIXES"] yang masuk L1; counter
+    seperti rate limit & lock tetap langsung ke L2. Setiap write/delete/incr
+    pada key L1 di-broadcast lewat Redis pub/sub supaya worker lain ikut evict.
+
+    OPTIONS:
+        L2: alias cache tujuan (default "redis")
+        L1_KEY_PREFIXES: list prefix key yang boleh di-cache di L1
+        L1_TTL: umur entry L1 dalam detik (default 5)
+        L1_MAX_ENTRIES: jumlah entry L1 maksimum (default 1024)
+        INVALIDATION_CHANNEL: channel pub/sub (default "lms:l1:invalidate")
+        ASYNC_REDIS: aget() langsung lewat redis.asyncio ke LOCATION L2
+            (default True; False = pakai aget() bawaan L2)
+        ASYNC_CONNECTION_CLASS: connection class redis.asyncio (class atau
+            dotted path), mis. fakeredis untuk benchmark/test
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._l2_alias = options.get("L2", "redis")
+        self._l1_prefixes = tuple(options.get("L1_KEY_PREFIXES", ()))
+        self._l1_ttl = options.get("L1_TTL", 5)
+        self._channel = options.get("INVALIDATION_CHANNEL", "lms:l1:invalidate")
+        self._shared = _shared_l1(
+            (self._l2_alias, self._channel, self._l1_prefixes),
+            options.get("L1_MAX_ENTRIES", 1024), self._l1_ttl,
+        )
+        self._l1 = self._shared.cache
+        self._async_enabled = options.get("ASYNC_REDIS", True)
+        connection_class = options.get("ASYNC_CONNECTION_CLASS")
+        if isinstance(connection_class, str):
+            connection_class = import_string(connection_class)
+        self._async_connection_class = connection_class
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    # ---------- L1 helpers ----------
+    def _l1_enabled(self, key):
+        return bool(self._l1_prefixes) and key.startswith(self._l1_prefixes)
+
+    def _l1_store(self, key, version, value, timeout=DEFAULT_TIMEOUT):
+        ttl = self._l1_ttl
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            ttl = min(ttl, timeout)
+        self._l1.set((key, version), value, ttl)
+
+    def _redis(self):
+        try:
+            from django_redis import get_redis_connection
+            return get_redis_connection(self._l2_alias)
+        except (ImportError, NotImplementedError):
+            return None
+
+    async def _async_redis(self):
+        """redis.asyncio client untuk L2 (satu per event loop per process), None kalau L2 bukan Redis."""
+        if not self._async_enabled or not hasattr(self.l2, "client"):
+            return None
+        return await _async_client(
+            settings.CACHES[self._l2_alias]["LOCATION"], self._async_connection_class
+        )
+
+    def _invalidate(self, keys, version=None):
+        keys = [k for k in keys if self._l1_enabled(k)]
+        if not keys:
+            return
+        for key in keys:
+            self._l1.delete((key, version))
+
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.publish(self._channel, json.dumps({"keys": keys, "version": version}))
+        except Exception:
+            # Redis down: L1 worker lain tetap expire sendiri dalam L1_TTL
+            logger.warning("L1 invalidation publish failed", exc_info=True)
+
+    def _ensure_listener(self):
+        # thread hilang setelah fork (gunicorn --preload): start ulang per pid
+        shared = self._shared
+        pid = os.getpid()
+        if shared.listener_pid == pid:
+            return
+        with shared.lock:
+            if shared.listener_pid == pid:
+                return
+            shared.listener_pid = pid
+            if self._redis() is None:
+                return
+            thread = threading.Thread(
+                target=self._listen, name="lms-l1-invalidation", daemon=True
+            )
+            thread.start()
+
+    def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                # pesan yang terlewat selama reconnect tidak bisa diketahui
+                self._l1.clear()
+                for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("clear"):
+                        self._l1.clear()
+                        continue
+                    for key in payload["keys"]:
+                        self._l1.delete((key, payload["version"]))
+            except Exception:
+                logger.warning("L1 invalidation listener reconnecting", exc_info=True)
+                time.sleep(1)
+            finally:
+                # koneksi pub/sub lama harus dikembalikan, kalau tidak pool bocor
+                if pubsub is not None:
+                    pubsub.close()
+
+    # ---------- cache API ----------
+    def get(self, key, default=None, version=None):
+        if self._l1_enabled(key):
+            self._ensure_listener()
+            value = self._l1.get((key, version), _MISSING)
+            if value is not _MISSING:
+                return value
+            value = self.l2.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self._l1_store(key, version, value)
+            return value
+        return self.l2.get(key, default, version=version)
+
+    async def aget(self, key, default=None, version=None):
+        # L1 hit dijawab langsung di event loop, tanpa thread hop
+        l1 = self._l1_enabled(key)
+        if l1:
+            self._ensure_listener()
+            value = self._l1.get((key, version), _MISSING)
+            if value is not _MISSING:
+                return value
+
+        client = await self._async_redis()
+        if client is None:
+            value = await self.l2.aget(key, _MISSING, version=version)
+        else:
+            # key & format data sama persis dengan django_redis (make_key/decode)
+            raw = await client.get(self.l2.client.make_key(key, version=version))
+            value = _MISSING if raw is None else self.l2.client.decode(raw)
+
+        if value is _MISSING:
+            return default
+        if l1:
+            self._l1_store(key, version, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote = []
+        for key in keys:
+            value = self._l1.get((key, version), _MISSING) if self._l1_enabled(key) else _MISSING
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        if remote:
+            fetched = self.l2.get_many(remote, version=version)
+            for key, value in fetched.items():
+                if self._l1_enabled(key):
+                    self._l1_store(key, version, value)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._invalidate([key], version)
+        if self._l1_enabled(key):
+            self._l1_store(key, version, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        # django_redis mengembalikan None, backend bawaan Django list key gagal
+        failed = self.l2.set_many(data, timeout, version=version) or []
+        self._invalidate(list(data), version)
+        for key, value in data.items():
+            if self._l1_enabled(key) and key not in failed:
+                self._l1_store(key, version, value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._invalidate([key], version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.l2.delete(key, version=version)
+        self._invalidate([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.l2.delete_many(keys, version=version)
+        self._invalidate(keys, version)
+
+    def has_key(self, key, version=None):
+        if self._l1_enabled(key) and self._l1.get((key, version), _MISSING) is not _MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        self._invalidate([key], version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def clear(self):
+        self.l2.clear()
+        self._l1.clear()
+        client = self._redis()
+        if client is not None:
+            client.publish(self._channel, json.dumps({"clear": True}))
@@ -0,0 +1,146 @@
+from django.db.models import (
+    Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.db.models.lookups import GreaterThan
+
+from .models import Course, Lesson, Assignment, Submission
+
+# ======================
+# AGREGAT INCREMENTAL
+# Course.lesson_count / assignment_count dan Assignment.submission_count /
+# graded_count / grade_sum / average_grade di-update dengan F() (atomic di DB,
+# aman dari race antar worker) setiap kali lesson/assignment/submission
+# dibuat, dihapus, atau dinilai. Dashboard cukup membaca kolom, tanpa
+# COUNT/AVG. Drift (raw SQL, crash di tengah jalan) -> recount().
+# Pengurangan di-clamp ke 0: counter yang sudah drift ke bawah tidak boleh
+# melanggar CHECK >= 0 (PositiveIntegerField) dan menggagalkan delete.
+# Course.grade_version ikut naik setiap assignment/submission/nilai di course
+# itu berubah: jadi versi cache gradebook (gradebook.py).
+# ======================
+COURSE_COUNTERS = {Lesson: "lesson_count", Assignment: "assignment_count"}
+
+
+def _counter(field, delta):
+    return Greatest(F(field) + delta, 0) if delta < 0 else F(field) + delta
+
+
+def _average(grade_sum, graded_count):
+    # NULL kalau belum ada yang dinilai; Cast supaya tidak integer division
+    return Case(
+        When(GreaterThan(graded_count, 0),
+             then=Cast(grade_sum, FloatField()) / graded_count),
+        default=Value(None),
+        output_field=FloatField(),
+    )
+
+
+def bump_course(model, course_ids):
+    """+/- jumlah child `model` (Lesson/Assignment) per course: {course_id: delta}."""
+    field = COURSE_COUNTERS[model]
+    # satu UPDATE per nilai delta yang berbeda (bulk import biasanya 1-2 nilai)
+    by_delta = {}
+    for course_id, delta in course_ids.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(course_id)
+    changes = {}
+    if model is Assignment:
+        # kolom gradebook ikut berubah, versi naik di UPDATE yang sama
+        changes["grade_version"] = F("grade_version") + 1
+    for delta, ids in by_delta.items():
+        Course.objects.filter(pk__in=ids).update(**{field: _counter(field, delta)}, **changes)
+
+
+def bump_grade_version(course_id=None, assignment_id=None):
+    """Invalidasi cache gradebook satu course (langsung, atau lewat assignment-nya)."""
+    qs = Course.objects.filter(pk=course_id) if course_id else Course.objects.filter(
+        pk__in=Assignment.objects.filter(pk=assignment_id).values("course_id")
+    )
+    qs.update(grade_version=F("grade_version") + 1)
+
+
+def grade_delta(old, new):
+    """(graded, sum) yang berubah saat grade old -> new (None = belum dinilai)."""
+    return (new is not None) - (old is not None), (new or 0) - (old or 0)
+
+
+def bump_assignment(assignment_id, submissions=0, graded=0, grade_sum=0, regraded=False):
+    """
+    Tambah delta agregat satu assignment + naikkan versi gradebook course-nya.
+    regraded: ada nilai yang berubah walau delta bersih 0 (mis. dua nilai
+    ditukar 80 <-> 90); agregat tetap, tapi isi gradebook tidak.
+    """
+    if not (submissions or graded or grade_sum):
+        if regraded:
+            bump_grade_version(assignment_id=assignment_id)
+        return
+    # di UPDATE semua F() membaca nilai lama baris, jadi rata-rata dihitung
+    # dari (lama + delta) di statement yang sama
+    new_sum = F("grade_sum") + grade_sum
+    new_graded = _counter("graded_count", graded)
+    Assignment.objects.filter(pk=assignment_id).update(
+        submission_count=_counter("submission_count", submissions),
+        graded_count=new_graded,
+        grade_sum=new_sum,
+        average_grade=_average(new_sum, new_graded),
+    )
+    bump_grade_version(assignment_id=assignment_id)
+
+
+# ---------- full recount ----------
+def _subquery(qs, fk, aggregate):
+    return Coalesce(
+        Subquery(
+            qs.filter(**{fk: OuterRef("pk")}).order_by()
+            .values(fk).annotate(value=aggregate).values("value")
+        ),
+        0,
+    )
+
+
+def _course_expected():
+    return {
+        "lesson_count": _subquery(Lesson.objects.all(), "course", Count("pk")),
+        "assignment_count": _subquery(Assignment.objects.all(), "course", Count("pk")),
+    }
+
+
+def _assignment_expected():
+    graded = Submission.objects.filter(grade__isnull=False)
+    return {
+        "submission_count": _subquery(Submission.objects.all(), "assignment", Count("pk")),
+        "graded_count": _subquery(graded, "assignment", Count("pk")),
+        "grade_sum": _subquery(graded, "assignment", Sum("grade")),
+    }
+
+
+def _drifted(model, expected):
+    # alias -> nama yang tidak bentrok dengan kolom
+    qs = model.objects.alias(**{f"expected_{k}": v for k, v in expected.items()})
+    mismatch = None
+    for field in expected:
+        q = ~Q(**{field: F(f"expected_{field}")})
+        mismatch = q if mismatch is None else mismatch | q
+    return list(qs.filter(mismatch).values_list("pk", flat=True))
+
+
+def recount(dry_run=False):
+    """
+    Hitung ulang semua agregat dari tabel sumber. Hanya baris yang drift yang
+    di-UPDATE. Return {"course": [pk...], "assignment": [pk...]} yang drift.
+    """
+    drift = {
+        "course": _drifted(Course, _course_expected()),
+        "assignment": _drifted(Assignment, _assignment_expected()),
+    }
+    if dry_run:
+        return drift
+    if drift["course"]:
+        Course.objects.filter(pk__in=drift["course"]).update(**_course_expected())
+    if drift["assignment"]:
+        expected = _assignment_expected()
+        Assignment.objects.filter(pk__in=drift["assignment"]).update(
+            **expected,
+            average_grade=_average(expected["grade_sum"], expected["graded_count"]),
+        )
+    return drift
@@ -0,0 +1,164 @@
+import functools
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from ninja.errors import HttpError
+
+# ======================
+# PROTECTED MEDIA DOWNLOAD
+# RBAC dicek di Python, transfer byte diserahkan ke proxy:
+# - "nginx": X-Accel-Redirect ke location internal (LMS_SENDFILE_URL_PREFIX)
+# - "xsendfile": X-Sendfile path absolut (Apache mod_xsendfile, lighttpd)
+# - kosong: FileResponse (wsgi.file_wrapper/sendfile) + Range + conditional GET
+# Client tidak pernah menerima path storage / MEDIA_URL: Submission.file
+# selalu dikirim sebagai URL endpoint download ini (submission_file_url).
+# ======================
+SENDFILE_BACKEND = getattr(settings, "LMS_SENDFILE_BACKEND", "")
+SENDFILE_URL_PREFIX = getattr(settings, "LMS_SENDFILE_URL_PREFIX", "/protected/")
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+# url_name endpoint GET /submissions/{id}/file (api.py), namespace default NinjaAPI
+SUBMISSION_FILE_URL_NAME = "api-1.0.0:submission_file"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _content_disposition(filename):
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+def _parse_range(header, size):
+    """Satu range `bytes=a-b` -> (start, end) inklusif; None = kirim utuh."""
+    match = _RANGE.match(header.strip()) if header else None
+    if not match:
+        # multi-range / unit lain tidak didukung: abaikan, kirim 200 utuh
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # suffix range: N byte terakhir
+        start = max(0, size - int(last))
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _iter_range(fh, start, length):
+    try:
+        fh.seek(start)
+        while length > 0:
+            block = fh.read(min(DOWNLOAD_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        fh.close()
+
+
+def _file_response(request, path, filename):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise HttpError(404, "File not found")
+
+    # nama file dedup sudah mengandung SHA-256 isi; mtime+size cukup sebagai ETag
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:
+        return conditional
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = _parse_range(request.headers.get("Range"), stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+
+    fh = open(path, "rb")
+    if byte_range is None:
+        # file object asli -> server WSGI bisa pakai sendfile()
+        response = FileResponse(fh, as_attachment=True, filename=filename)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_range(fh, start, length), status=206)
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Type"] = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response["Content-Disposition"] = _content_disposition(filename)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def serve_file(request, field_file, filename=None):
+    """Response download untuk FieldFile yang sudah lolos RBAC."""
+    if not field_file:
+        raise HttpError(404, "File not found")
+    filename = filename or os.path.basename(field_file.name)
+
+    if SENDFILE_BACKEND in ("nginx", "xsendfile"):
+        response = HttpResponse()
+        if SENDFILE_BACKEND == "nginx":
+            # Range, ETag, sendfile ditangani nginx dari location internal
+            response["X-Accel-Redirect"] = SENDFILE_URL_PREFIX + quote(field_file.name)
+        else:
+            response["X-Sendfile"] = field_file.path
+        # Content-Type dari proxy (mime types nginx/Apache), bukan text/html Django
+        del response["Content-Type"]
+        response["Content-Disposition"] = _content_disposition(filename)
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    return _file_response(request, field_file.path, filename)
+
+
+@functools.cache
+def _submission_file_url_parts():
+    # reverse() sekali, sisanya format string: dipanggil per baris di page list
+    url = reverse(SUBMISSION_FILE_URL_NAME, kwargs={"submission_id": 0})
+    head, tail = url.rsplit("/0/", 1)
+    return f"{head}/", f"/{tail}"
+
+
+def submission_file_url(submission_id, name):
+    """URL download terproteksi untuk Submission.file (None kalau belum ada file)."""
+    if not name:
+        return None
+    head, tail = _submission_file_url_parts()
+    return f"{head}{submission_id}{tail}"
+
+
+def with_file_urls(page):
+    """Page .values() submission: kolom file (kalau ikut di-projection) -> URL download."""
+    for row in page["items"]:
+        if "file" in row:
+            row["file"] = submission_file_url(row["id"], row["file"])
+    return page
+
+
+def file_url_rows(rows, columns):
+    """Baris values_list submission (export): kolom file -> URL download."""
+    id_at, file_at = columns.index("id"), columns.index("file")
+    for row in rows:
+        row = list(row)
+        row[file_at] = submission_file_url(row[id_at], row[file_at])
+        yield row
@@ -0,0 +1,53 @@
+import csv
+
+from django.http import StreamingHttpResponse
+
+from .renderers import json_dumps
+
+# ======================
+# STREAMING EXPORT (NDJSON / CSV)
+# ======================
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class _Echo:
+    """Pseudo-buffer untuk csv.writer: write() langsung mengembalikan baris."""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows, columns):
+    for row in rows:
+        yield json_dumps(dict(zip(columns, row))) + b"\n"
+
+
+def iter_csv(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_queryset(qs, columns, fmt, filename, transform=None):
+    """
+    Stream baris `qs.values_list(*columns)` tanpa menampung seluruh hasil di memori.
+    `.iterator()` membaca per chunk (server-side cursor di PostgreSQL).
+    `transform(rows, columns)`: generator opsional untuk mengubah baris (mis. URL file).
+    """
+    # generator baru jalan setelah view return: kunci alias DB (replica) sekarang
+    qs = qs.using(qs.db)
+    rows = qs.values_list(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    if transform is not None:
+        rows = transform(rows, columns)
+    body = iter_csv(rows, columns) if fmt == "csv" else iter_ndjson(rows, columns)
+
+    response = StreamingHttpResponse(body, content_type=EXPORT_CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+
+from .models import Lesson, Assignment, Submission
+
+# ======================
+# FILTER LIST ENDPOINT
+# Dipakai versi sync (api.py) maupun async (api_async.py) supaya filter &
+# aturan akses selalu sama. Semua filter jadi WHERE di queryset, didukung
+# index di models.py.
+# ======================
+
+
+def lesson_queryset(course_id: Optional[int] = None):
+    qs = Lesson.objects.all()
+    if course_id is not None:
+        qs = qs.filter(course_id=course_id)
+    return qs
+
+
+def assignment_queryset(course_id: Optional[int] = None,
+                        deadline_after: Optional[datetime] = None,
+                        deadline_before: Optional[datetime] = None):
+    qs = Assignment.objects.all()
+    if course_id is not None:
+        qs = qs.filter(course_id=course_id)
+    if deadline_after is not None:
+        qs = qs.filter(deadline__gte=deadline_after)
+    if deadline_before is not None:
+        qs = qs.filter(deadline__lt=deadline_before)
+    return qs
+
+
+def assignment_page_key(deadline_after: Optional[datetime] = None,
+                        deadline_before: Optional[datetime] = None) -> Optional[str]:
+    # filter range deadline -> page urut (deadline, id), dilayani index
+    # assignment_deadline_id_idx; urut id saja memaksa scan seluruh tabel
+    if deadline_after is not None or deadline_before is not None:
+        return "deadline"
+    return None
+
+
+def submission_queryset(user, assignment_id: Optional[int] = None,
+                        student_id: Optional[int] = None,
+                        course_id: Optional[int] = None,
+                        graded: Optional[bool] = None):
+    qs = Submission.objects.all()
+    # mahasiswa hanya melihat submission miliknya sendiri, apa pun filternya
+    if user.role == "mahasiswa":
+        qs = qs.filter(student_id=user.id)
+    if assignment_id is not None:
+        qs = qs.filter(assignment_id=assignment_id)
+    if student_id is not None:
+        qs = qs.filter(student_id=student_id)
+    if course_id is not None:
+        qs = qs.filter(assignment__course_id=course_id)
+    if graded is not None:
+        qs = qs.filter(grade__isnull=not graded)
+    return qs
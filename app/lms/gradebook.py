@@ -0,0 +1,112 @@
+import csv
+import io
+import time
+from array import array
+
+from .metrics import record_serialization
+from .models import Assignment, Submission
+from .renderers import json_dumps
+
+# ======================
+# GRADEBOOK (mahasiswa x assignment satu course)
+# Satu query values_list submission JOIN assignment, di-pivot ke array int
+# datar (baris = mahasiswa, kolom = assignment) alih-alih dict per sel:
+# 1000 x 50 = 50k sel cukup ~200 KB dan encode CSV/JSON tinggal iterasi slice.
+# Cache: key versioned oleh Course.grade_version (counters.py).
+# ======================
+GRADEBOOK_CACHE_KEY = "cache:gradebook"
+GRADEBOOK_CACHE_TTL = 300  # detik; versi baru = key baru, TTL hanya untuk buang memori
+GRADEBOOK_FORMATS = {
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+NO_GRADE = -(2 ** 31)  # sentinel sel: belum submit / belum dinilai
+
+
+class Gradebook:
+    __slots__ = ("course_id", "assignments", "students", "grades")
+
+    def __init__(self, course_id, assignments, students, grades):
+        self.course_id = course_id
+        self.assignments = assignments  # [(id, title, deadline)] urut deadline
+        self.students = students        # [(id, username)] urut username
+        self.grades = grades            # array("i"), len = students x assignments
+
+    def rows(self):
+        """(student, [grade atau None per assignment]) per mahasiswa."""
+        width = len(self.assignments)
+        for i, student in enumerate(self.students):
+            row = self.grades[i * width:(i + 1) * width]
+            yield student, [None if g == NO_GRADE else g for g in row]
+
+    def to_json(self) -> bytes:
+        data = {
+            "course_id": self.course_id,
+            "assignments": [
+                {"id": a_id, "title": title, "deadline": deadline}
+                for a_id, title, deadline in self.assignments
+            ],
+            "students": [{"id": s_id, "username": name} for s_id, name in self.students],
+            # grades[i][j] = nilai students[i] untuk assignments[j]
+            "grades": [grades for _, grades in self.rows()],
+        }
+        return json_dumps(data)
+
+    def to_csv(self) -> bytes:
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(
+            ["student_id", "username", *(f"{title} (#{a_id})" for a_id, title, _ in self.assignments)]
+        )
+        for (s_id, name), grades in self.rows():
+            writer.writerow([s_id, name, *("" if g is None else g for g in grades)])
+        return out.getvalue().encode()
+
+    def render(self, fmt) -> bytes:
+        started = time.perf_counter()
+        try:
+            return self.to_csv() if fmt == "csv" else self.to_json()
+        finally:
+            record_serialization(time.perf_counter() - started)
+
+
+def gradebook_queryset(course_id):
+    """Isi matriks: satu baris per submission, hanya kolom int + username."""
+    return (
+        Submission.objects.filter(assignment__course_id=course_id)
+        .order_by()
+        .values_list("assignment_id", "student_id", "student__username", "grade")
+    )
+
+
+def build_gradebook(course_id) -> Gradebook:
+    """
+    Header kolom dari query kecil assignment (urut deadline), isi matriks dari
+    satu query submission JOIN assignment. Kolom tanggal/judul tidak diulang
+    per sel: konversi datetime per baris justru yang paling mahal.
+    Mahasiswa = yang pernah submit di course ini (belum ada tabel enrollment).
+    """
+    assignments = list(
+        Assignment.objects.filter(course_id=course_id)
+        .order_by("deadline", "id")
+        .values_list("id", "title", "deadline")
+    )
+    columns = {a_id: col for col, (a_id, _, _) in enumerate(assignments)}
+
+    students, cells = {}, []
+    for a_id, s_id, username, grade in gradebook_queryset(course_id):
+        col = columns.get(a_id)
+        if col is None:
+            # assignment dibuat di antara dua query: masuk di build berikutnya
+            continue
+        students[s_id] = username
+        if grade is not None:
+            cells.append((s_id, col, grade))
+
+    ordered = sorted(students.items(), key=lambda item: (item[1], item[0]))
+    index = {s_id: i for i, (s_id, _) in enumerate(ordered)}
+    width = len(assignments)
+    grades = array("i", [NO_GRADE]) * (len(ordered) * width)
+    for s_id, col, grade in cells:
+        grades[index[s_id] * width + col] = grade
+    return Gradebook(course_id, assignments, ordered, grades)
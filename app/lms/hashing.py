@@ -0,0 +1,102 @@
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    check_password, get_hasher, identify_hasher, make_password,
+)
+from ninja.errors import HttpError
+
+from .lru import TTLCache
+
+# ======================
+# PASSWORD HASHING POOL
+# PBKDF2 (hashlib) melepas GIL, jadi thread pool kecil cukup untuk membatasi
+# berapa core yang boleh dipakai hashing; request baca tidak ikut kelaparan.
+# ======================
+HASH_WORKERS = getattr(settings, "LMS_HASH_WORKERS", 2)
+HASH_QUEUE_DEPTH = getattr(settings, "LMS_HASH_QUEUE_DEPTH", 16)
+HASH_TIMEOUT = 10  # detik
+
+# hasil verifikasi yang sukses, key = HMAC(SECRET_KEY, user + hash + password);
+# hanya di memori process, tidak pernah dikirim ke Redis
+VERIFIED_CACHE_TTL = getattr(settings, "LMS_VERIFIED_PASSWORD_TTL", 300)
+_verified = TTLCache(maxsize=10000, ttl=VERIFIED_CACHE_TTL)
+
+_pool = None
+_slots = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # executor tidak ikut ter-fork dengan benar: buat ulang per pid
+    global _pool, _slots, _pool_pid
+    pid = os.getpid()
+    if _pool_pid != pid:
+        with _pool_lock:
+            if _pool_pid != pid:
+                _pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="lms-hash")
+                _slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_DEPTH)
+                _pool_pid = pid
+    return _pool, _slots
+
+
+def run_hash(fn, *args):
+    """Jalankan fn di hashing pool; 503 kalau antrean penuh atau tidak selesai dalam HASH_TIMEOUT."""
+    pool, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise HttpError(503, "Server busy, please retry")
+    try:
+        future = pool.submit(fn, *args)
+    except RuntimeError:
+        slots.release()
+        raise
+    # slot dilepas saat job selesai atau dibatalkan (callback juga jalan saat cancel)
+    future.add_done_callback(lambda f: slots.release())
+    try:
+        return future.result(timeout=HASH_TIMEOUT)
+    except FutureTimeout:
+        # masih antre -> dibatalkan, slot langsung kembali; yang sudah jalan
+        # tetap memegang slot sampai selesai (memang sedang memakai worker)
+        future.cancel()
+        raise HttpError(503, "Server busy, please retry")
+
+
+def hash_password(raw_password):
+    return run_hash(make_password, raw_password)
+
+
+def _credential_digest(user, raw_password):
+    # hash tersimpan ikut di-digest: ganti password otomatis membatalkan cache
+    msg = f"{user.pk}:{user.password}:{raw_password}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), msg, hashlib.sha256).digest()
+
+
+def _needs_rehash(encoded):
+    preferred = get_hasher("default")
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def verify_password(user, raw_password) -> bool:
+    digest = _credential_digest(user, raw_password)
+    if _verified.get(digest):
+        return True
+
+    if not run_hash(check_password, raw_password, user.password):
+        return False
+
+    if _needs_rehash(user.password):
+        user.password = hash_password(raw_password)
+        user.save(update_fields=["password"])
+        digest = _credential_digest(user, raw_password)
+
+    _verified.set(digest, True)
+    return True
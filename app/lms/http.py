@@ -0,0 +1,86 @@
+import time
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from . import metrics
+from .cache import cached_build, generation, params_digest
+from .renderers import json_dumps
+
+# ======================
+# PRE-SERIALIZED JSON + CONDITIONAL GET
+# ======================
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+def dump_json(data) -> bytes:
+    """Encode sekali (mis. saat build cache), hasilnya bytes siap kirim."""
+    started = time.perf_counter()
+    try:
+        return json_dumps(data)
+    finally:
+        metrics.record_serialization(time.perf_counter() - started)
+
+
+def json_response(data, status=200):
+    """
+    dict/list yang sudah final (mis. hasil paginate()) langsung jadi response:
+    Ninja tidak memvalidasi + dump ulang lewat schema `response=` (schema
+    tetap dipakai untuk dokumentasi OpenAPI).
+    """
+    response = bytes_response(dump_json(data), JSON_CONTENT_TYPE, cache_control=None)
+    response.status_code = status
+    return response
+
+
+def etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if "*" in etags:
+        return True
+    # weak comparison (RFC 9110 13.1.2)
+    bare = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == bare for tag in etags)
+
+
+def json_bytes_response(body: bytes, *, etag=None, cache_control="private, no-cache"):
+    return bytes_response(body, JSON_CONTENT_TYPE, etag=etag, cache_control=cache_control)
+
+
+def bytes_response(body: bytes, content_type, *, etag=None, cache_control="private, no-cache"):
+    response = HttpResponse(body, content_type=content_type)
+    if etag:
+        response["ETag"] = etag
+    if cache_control:
+        response["Cache-Control"] = cache_control
+    return response
+
+
+def not_modified(etag: str, cache_control="private, no-cache"):
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    if cache_control:
+        response["Cache-Control"] = cache_control
+    return response
+
+
+def cached_json_response(request, name, params: dict, build, ttl: int):
+    """
+    Response JSON dari cache versioned `name` (lihat cache.py): ETag =
+    generation + params, If-None-Match yang cocok langsung 304, dan yang
+    disimpan di cache adalah bytes final hasil `build()`.
+    """
+    gen = generation(name)
+    etag = f'"{gen}-{params_digest(params)}"'
+    if etag_matches(request, etag):
+        metrics.record_cache(name, "not_modified")
+        return not_modified(etag)
+
+    def build_entry():
+        # ETag ikut disimpan: entry basi tetap membawa ETag generation pembuatnya
+        return etag, dump_json(build())
+
+    body_etag, body = cached_build(name, params, build_entry, ttl, gen=gen)
+    return json_bytes_response(body, etag=body_etag)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from lms.uploads import UPLOAD_EXPIRY, cleanup_expired
+
+
+class Command(BaseCommand):
+    help = "Hapus chunked upload yang tidak pernah di-finalize (jalankan via cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age", type=int, default=UPLOAD_EXPIRY,
+            help=f"umur maksimum upload dalam detik (default {UPLOAD_EXPIRY})",
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup_expired(options["max_age"])
+        self.stdout.write(self.style.SUCCESS(f"{removed} upload kedaluwarsa dihapus"))
@@ -0,0 +1,125 @@
+import re
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from lms.filters import (
+    assignment_page_key, assignment_queryset, lesson_queryset, submission_queryset,
+)
+from lms.gradebook import gradebook_queryset
+from lms.models import User, Course, Lesson, Assignment, Submission
+from lms.pagination import _page_queryset, encode_cursor
+from lms.schemas import (
+    UserSchema, CourseSchema, LessonSchema, AssignmentSchema, SubmissionSchema,
+)
+
+# SQLite: "SCAN lms_course" (tanpa USING ... INDEX) = full table scan
+# PostgreSQL: "Seq Scan on lms_course"
+SEQ_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)"),
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+}
+
+
+def _page(qs, schema, cursor_pk, descending=False, key=None):
+    # query yang sama dengan endpoint list saat mengambil page berikutnya
+    cursor = encode_cursor(cursor_pk) if cursor_pk else None
+    page_qs, _, _ = _page_queryset(
+        qs, limit=50, cursor=cursor, fields=None,
+        allowed=schema.model_fields, descending=descending, key=key,
+    )
+    return page_qs
+
+
+def endpoint_querysets():
+    course = Course.objects.order_by("id").values("id", "instructor_id").first() or {}
+    submission = (
+        Submission.objects.order_by("id").values("id", "assignment_id", "student_id").first() or {}
+    )
+    assignment = Assignment.objects.order_by("-deadline").values("deadline").first() or {}
+    # principal dummy: mahasiswa otomatis difilter ke student_id-nya sendiri
+    student = User(id=submission.get("student_id", 0), role="mahasiswa")
+    staff = User(role="admin")
+    mid = lambda model: (model.objects.order_by("-id").values_list("id", flat=True).first() or 0) // 2  # noqa: E731
+
+    return {
+        "list_users": _page(User.objects.all(), UserSchema, mid(User)),
+        "list_courses": _page(Course.objects.all(), CourseSchema, mid(Course), descending=True),
+        "courses_by_instructor": Course.objects.filter(
+            instructor_id=course.get("instructor_id", 0)
+        ).order_by("-created_at")[:50],
+        "list_lessons": _page(Lesson.objects.all(), LessonSchema, mid(Lesson)),
+        "list_assignments": _page(Assignment.objects.all(), AssignmentSchema, mid(Assignment)),
+        "assignments_by_course": Assignment.objects.filter(
+            course_id=course.get("id", 0)
+        ).order_by("deadline")[:50],
+        "list_submissions": _page(Submission.objects.all(), SubmissionSchema, mid(Submission)),
+        "lessons_by_course": _page(
+            lesson_queryset(course.get("id", 0)), LessonSchema, None,
+        ),
+        "assignments_by_deadline": _page(
+            assignment_queryset(deadline_after=assignment.get("deadline")),
+            AssignmentSchema, None, key=assignment_page_key(assignment.get("deadline")),
+        ),
+        "submissions_of_student": _page(
+            submission_queryset(student), SubmissionSchema, None,
+        ),
+        "submissions_by_assignment": _page(
+            submission_queryset(staff, assignment_id=submission.get("assignment_id", 0)),
+            SubmissionSchema, None,
+        ),
+        "course_gradebook": gradebook_queryset(course.get("id", 0)),
+        "submissions_by_assignment_student": Submission.objects.filter(
+            assignment_id=submission.get("assignment_id", 0),
+            student_id=submission.get("student_id", 0),
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Jalankan EXPLAIN untuk queryset tiap endpoint list dan gagal (exit 1) "
+        "kalau ada sequential scan pada tabel besar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows", type=int, default=1000,
+            help="tabel dengan baris >= nilai ini dianggap besar (default 1000)",
+        )
+        parser.add_argument("--verbose-plan", action="store_true", help="cetak plan lengkap")
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Backend {connection.vendor} belum didukung")
+
+        tables = {m._meta.db_table: m for m in apps.get_app_config("lms").get_models()}
+        row_counts = {}
+        failures = []
+
+        for name, qs in endpoint_querysets().items():
+            plan = qs.explain()
+            if options["verbose_plan"]:
+                self.stdout.write(f"--- {name}\n{plan}")
+
+            scanned = set(pattern.findall(plan))
+            large = []
+            for table in scanned:
+                model = tables.get(table)
+                if model is None:
+                    continue
+                if table not in row_counts:
+                    row_counts[table] = model.objects.count()
+                if row_counts[table] >= options["min_rows"]:
+                    large.append(f"{table} ({row_counts[table]} rows)")
+
+            if large:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: seq scan on {', '.join(large)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+
+        if failures:
+            raise CommandError(f"Sequential scan on large tables: {', '.join(failures)}")
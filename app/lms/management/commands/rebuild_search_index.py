@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from lms.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Bangun ulang index full-text courses + lessons (SQLite FTS5). "
+        "PostgreSQL memakai expression GIN index yang selalu up to date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if connections[using].vendor != "sqlite":
+            self.stdout.write(f"{connections[using].vendor}: index dikelola DB, tidak ada yang dibangun ulang")
+            return
+        with transaction.atomic(using=using):
+            count = rebuild_index(using)
+        self.stdout.write(self.style.SUCCESS(f"{count} dokumen di-index"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lms.counters import recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Hitung ulang agregat Course (lesson_count, assignment_count) dan "
+        "Assignment (submission_count, graded_count, grade_sum, average_grade) "
+        "dari tabel sumber, untuk memperbaiki drift counter incremental."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="hanya laporkan baris yang drift",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = recount(dry_run=options["dry_run"])
+        for name, pks in drift.items():
+            sample = ", ".join(map(str, pks[:20])) + (" ..." if len(pks) > 20 else "")
+            self.stdout.write(f"{name}: {len(pks)} drift" + (f" ({sample})" if pks else ""))
+        if options["dry_run"]:
+            return
+        total = sum(len(pks) for pks in drift.values())
+        self.stdout.write(self.style.SUCCESS(f"{total} baris diperbaiki"))
@@ -0,0 +1,320 @@
+import atexit
+import contextvars
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# ======================
+# METRICS PER REQUEST
+# MetricsMiddleware membuat RequestStats per request (contextvar, ikut ke
+# thread sync_to_async); DB wrapper, cached_build, RateLimit dan renderer
+# JSON menambah angka ke situ. Di akhir request: header Server-Timing +
+# histogram per endpoint di registry in-process, dibaca GET /metrics.
+# ======================
+METRICS_ENABLED = getattr(settings, "LMS_METRICS_ENABLED", True)
+SERVER_TIMING = getattr(settings, "LMS_SERVER_TIMING", settings.DEBUG)
+# gunicorn multi-worker: tiap worker menulis snapshot ke folder ini,
+# /metrics menjumlahkan semuanya. Kosong = hanya worker yang melayani scrape.
+METRICS_DIR = getattr(settings, "LMS_METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = getattr(settings, "LMS_METRICS_FLUSH_INTERVAL", 5.0)  # detik
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# nama metric -> (type, help, buckets)
+FAMILIES = {
+    "lms_requests_total": ("counter", "Jumlah request per endpoint dan status", None),
+    "lms_request_duration_seconds": ("histogram", "Wall time request", LATENCY_BUCKETS),
+    "lms_db_queries_per_request": ("histogram", "Jumlah query SQL per request", QUERY_BUCKETS),
+    "lms_db_duration_seconds": ("histogram", "Total waktu query SQL per request", LATENCY_BUCKETS),
+    "lms_serialization_duration_seconds": (
+        "histogram", "Waktu encode JSON response per request", LATENCY_BUCKETS,
+    ),
+    "lms_cache_requests_total": ("counter", "Lookup cache per nama dan hasil", None),
+}
+
+
+class RequestStats:
+    __slots__ = ("db_count", "db_time", "serialize_time", "cache")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.cache = []  # (nama, hasil, detik atau None)
+
+
+_current = contextvars.ContextVar("lms_request_stats", default=None)
+
+
+def begin_request():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_cache(name, result, seconds=None):
+    """hit / miss / stale (cached_build), allowed / limited (rate limit)."""
+    stats = _current.get()
+    if stats is not None:
+        stats.cache.append((name, result, seconds))
+
+
+def record_serialization(seconds):
+    stats = _current.get()
+    if stats is not None:
+        stats.serialize_time += seconds
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - started
+        stats.db_count += 1
+
+
+def _install_db_wrapper(sender, connection, **kwargs):
+    # dipanggil tiap koneksi baru dibuka; DatabaseWrapper-nya bisa dipakai ulang
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+def install():
+    """Pasang DB wrapper: koneksi baru lewat signal, koneksi yang sudah terbuka langsung."""
+    connection_created.connect(_install_db_wrapper, dispatch_uid="lms.metrics.db")
+    for connection in connections.all(initialized_only=True):
+        _install_db_wrapper(None, connection)
+
+
+def server_timing(duration, stats) -> str:
+    parts = [
+        f"app;dur={duration * 1000:.2f}",
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.db_count} queries"',
+    ]
+    if stats.serialize_time:
+        parts.append(f"ser;dur={stats.serialize_time * 1000:.2f}")
+    for name, result, seconds in stats.cache:
+        dur = "" if seconds is None else f";dur={seconds * 1000:.2f}"
+        parts.append(f'cache{dur};desc="{name} {result}"')
+    return ", ".join(parts)
+
+
+# ---------- registry ----------
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # per bucket (non-kumulatif) + slot +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # bucket Prometheus "le": index bucket pertama yang >= value
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+# histogram per (endpoint, method), urutan = field EndpointSeries
+REQUEST_HISTOGRAMS = (
+    "lms_request_duration_seconds",
+    "lms_db_queries_per_request",
+    "lms_db_duration_seconds",
+    "lms_serialization_duration_seconds",
+)
+
+
+class EndpointSeries:
+    __slots__ = ("status", "histograms")
+
+    def __init__(self):
+        self.status = {}  # status code -> jumlah request
+        self.histograms = tuple(Histogram(FAMILIES[name][2]) for name in REQUEST_HISTOGRAMS)
+
+
+class Registry:
+    """
+    Counter & histogram in-process. Series per endpoint dibuat sekali, jadi
+    per request cukup satu lock + beberapa bisect (~1-2 mikrodetik).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}  # (endpoint, method) -> EndpointSeries
+        self._cache = {}   # (nama cache, hasil) -> jumlah
+
+    def observe_request(self, endpoint, method, status, duration, stats):
+        key = (endpoint, method)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = EndpointSeries()
+            series.status[status] = series.status.get(status, 0) + 1
+            wall, queries, db, ser = series.histograms
+            wall.observe(duration)
+            queries.observe(stats.db_count)
+            db.observe(stats.db_time)
+            ser.observe(stats.serialize_time)
+            for name, result, _ in stats.cache:
+                self._cache[(name, result)] = self._cache.get((name, result), 0) + 1
+
+    def snapshot(self) -> dict:
+        """Bentuk generik (nama, labels, ...) yang bisa di-JSON dan dijumlah antar worker."""
+        counters, histograms = [], []
+        with self._lock:
+            for (endpoint, method), series in self._series.items():
+                labels = [["endpoint", endpoint], ["method", method]]
+                for status, value in series.status.items():
+                    counters.append(
+                        ["lms_requests_total", labels + [["status", str(status)]], value]
+                    )
+                for name, h in zip(REQUEST_HISTOGRAMS, series.histograms):
+                    histograms.append([name, labels, list(h.counts), h.sum, h.count])
+            for (name, result), value in self._cache.items():
+                counters.append(
+                    ["lms_cache_requests_total", [["cache", name], ["result", result]], value]
+                )
+        return {"counters": counters, "histograms": histograms}
+
+
+registry = Registry()
+
+
+def observe_request(endpoint, method, status, duration, stats):
+    registry.observe_request(endpoint, method, status, duration, stats)
+    if METRICS_DIR:
+        snapshot_writer.ensure_started()
+
+
+# ---------- multi-process ----------
+class SnapshotWriter:
+    """Thread per worker yang menulis registry.snapshot() ke METRICS_DIR/<pid>-<start>.json."""
+
+    def __init__(self, directory=METRICS_DIR, interval=METRICS_FLUSH_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self.path = None
+
+    def ensure_started(self):
+        # thread tidak ikut ter-fork (gunicorn --preload): start ulang per pid
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            # start time di nama file: pid yang dipakai ulang tidak menimpa worker lama
+            self.path = os.path.join(self.directory, f"{pid}-{int(time.time() * 1000)}.json")
+            os.makedirs(self.directory, exist_ok=True)
+            threading.Thread(target=self._run, name="lms-metrics-writer", daemon=True).start()
+            atexit.register(self.write)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.write()
+
+    def write(self):
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as fh:
+                json.dump(registry.snapshot(), fh)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.exception("Gagal menulis snapshot metrics ke %s", self.path)
+
+
+snapshot_writer = SnapshotWriter()
+
+
+def _merge(counters, histograms, snapshot):
+    for name, labels, value in snapshot["counters"]:
+        key = (name, tuple(map(tuple, labels)))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, counts, total, count in snapshot["histograms"]:
+        if name not in FAMILIES or len(counts) != len(FAMILIES[name][2]) + 1:
+            continue  # snapshot dari versi dengan bucket berbeda
+        key = (name, tuple(map(tuple, labels)))
+        merged = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+        merged[0] = [a + b for a, b in zip(merged[0], counts)]
+        merged[1] += total
+        merged[2] += count
+
+
+def collect():
+    """Snapshot worker ini + (kalau METRICS_DIR) snapshot worker lain, dijumlah."""
+    counters, histograms = {}, {}
+    _merge(counters, histograms, registry.snapshot())
+    if METRICS_DIR:
+        # file worker yang sudah mati tetap dihitung (counter tidak boleh turun);
+        # folder dikosongkan saat gunicorn start, lihat gunicorn.conf.py
+        for path in glob.glob(os.path.join(METRICS_DIR, "*.json")):
+            if path == snapshot_writer.path and snapshot_writer._pid == os.getpid():
+                continue
+            try:
+                with open(path) as fh:
+                    _merge(counters, histograms, json.load(fh))
+            except (OSError, ValueError):
+                continue
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus() -> str:
+    """Text exposition format 0.0.4."""
+    counters, histograms = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in FAMILIES.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, n in zip(buckets + ("+Inf",), counts):
+                cumulative += n
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(float(total))}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,139 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.functional import SimpleLazyObject, empty
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _is_bearer(request):
+    return request.META.get("HTTP_AUTHORIZATION", "").startswith("Bearer ")
+
+
+class LazySessionMiddleware(SessionMiddleware):
+    """
+    SessionMiddleware yang tidak menyentuh session sama sekali untuk request
+    Bearer (JWT) yang tidak memakai request.session: SessionStore baru dibuat
+    saat diakses, dan process_response (save, cookie, Vary) dilewati kalau
+    tidak pernah diakses. Request lain (admin, browser) tetap seperti biasa.
+    """
+
+    def process_request(self, request):
+        if not _is_bearer(request):
+            return super().process_request(request)
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        request.session = SimpleLazyObject(lambda: self.SessionStore(session_key))
+
+    def process_response(self, request, response):
+        session = getattr(request, "session", None)
+        if isinstance(session, SimpleLazyObject) and session._wrapped is empty:
+            return response
+        return super().process_response(request, response)
+
+
+# ======================
+# METRICS + SAMPLING PROFILER
+# Taruh paling atas di MIDDLEWARE supaya wall time mencakup middleware lain.
+# Profiler opt-in: LMS_PROFILE_SAMPLE_RATE > 0 -> sebagian request (sync)
+# dijalankan di bawah cProfile, hasilnya disimpan/di-log kalau lebih lambat
+# dari LMS_PROFILE_SLOW_MS.
+# ======================
+PROFILE_SAMPLE_RATE = getattr(settings, "LMS_PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_SLOW_MS = getattr(settings, "LMS_PROFILE_SLOW_MS", 500)
+PROFILE_DIR = getattr(settings, "LMS_PROFILE_DIR", "")
+PROFILE_TOP = 25
+
+
+def _endpoint(request):
+    # route pola URL (mis. api/lms/courses/<int:course_id>), bukan path asli:
+    # label Prometheus harus berkardinalitas rendah
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else "unmatched"
+
+
+def _save_profile(profiler, request, duration):
+    endpoint = _endpoint(request)
+    if PROFILE_DIR:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = endpoint.strip("/").replace("/", "_").replace("<", "").replace(">", "") or "root"
+        path = os.path.join(PROFILE_DIR, f"{int(time.time() * 1000)}-{request.method}-{name}.prof")
+        profiler.dump_stats(path)
+        logger.warning("Slow request %s %s (%.0f ms), profile: %s",
+                       request.method, request.path, duration * 1000, path)
+        return
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    logger.warning("Slow request %s %s (%.0f ms)\n%s",
+                   request.method, request.path, duration * 1000, out.getvalue())
+
+
+class MetricsMiddleware:
+    """
+    Per request: wall time, jumlah & waktu query DB, lookup cache (course
+    catalogue, rate limit) dan waktu encode JSON. Dikirim di header
+    Server-Timing dan diagregasi ke histogram untuk GET /metrics.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        metrics.install()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _finish(self, request, response, stats, started):
+        duration = time.perf_counter() - started
+        if metrics.SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing(duration, stats)
+        metrics.observe_request(
+            _endpoint(request), request.method, response.status_code, duration, stats
+        )
+        return duration
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats, token = metrics.begin_request()
+        profiler = None
+        if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            if profiler is None:
+                response = self.get_response(request)
+            else:
+                response = profiler.runcall(self.get_response, request)
+            duration = self._finish(request, response, stats, started)
+        finally:
+            metrics.end_request(token)
+        if profiler is not None and duration * 1000 >= PROFILE_SLOW_MS:
+            _save_profile(profiler, request, duration)
+        return response
+
+    async def __acall__(self, request):
+        # cProfile per thread tidak bisa memisahkan coroutine yang berselang-seling
+        # di satu event loop, jadi profiler hanya untuk jalur sync
+        stats, token = metrics.begin_request()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+            self._finish(request, response, stats, started)
+        finally:
+            metrics.end_request(token)
+        return response
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+from django.db import migrations, models
+from django.db.models import Count
+
+DUPLICATE_REPORT_LIMIT = 50
+
+
+def check_duplicate_submissions(apps, schema_editor):
+    # sebelum unique (assignment, student): migration index tidak boleh menghapus
+    # data mahasiswa. Ada duplikat -> gagal dengan daftar pasangan; admin memilih
+    # sendiri submission yang dipertahankan, lalu migrate diulang.
+    Submission = apps.get_model("lms", "Submission")
+    duplicates = list(
+        Submission.objects.values_list("assignment_id", "student_id")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .order_by("assignment_id", "student_id")
+    )
+    if not duplicates:
+        return
+    shown = [
+        f"assignment={assignment_id} student={student_id} ({n} submissions)"
+        for assignment_id, student_id, n in duplicates[:DUPLICATE_REPORT_LIMIT]
+    ]
+    if len(duplicates) > DUPLICATE_REPORT_LIMIT:
+        shown.append(f"... and {len(duplicates) - DUPLICATE_REPORT_LIMIT} more pairs")
+    raise RuntimeError(
+        f"{len(duplicates)} (assignment, student) pairs have more than one submission; "
+        "keep one submission per pair before adding submission_assignment_student_uniq:\n  "
+        + "\n  ".join(shown)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['course', 'deadline'], name='assignment_course_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['instructor', '-created_at'], name='course_instructor_created_idx'),
+        ),
+        migrations.RunPython(check_duplicate_submissions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='submission',
+            constraint=models.UniqueConstraint(fields=('assignment', 'student'), name='submission_assignment_student_uniq'),
+        ),
+    ]
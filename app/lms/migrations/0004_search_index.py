@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# tokenchars default unicode61; prefix index untuk autocomplete 2-4 huruf
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS lms_search USING fts5(
+    kind UNINDEXED, course_id UNINDEXED, title, body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4'
+)
+"""
+SQLITE_BACKFILL = [
+    "INSERT INTO lms_search (rowid, kind, course_id, title, body) "
+    "SELECT id * 2, 'course', id, title, description FROM lms_course",
+    "INSERT INTO lms_search (rowid, kind, course_id, title, body) "
+    "SELECT id * 2 + 1, 'lesson', course_id, title, content FROM lms_lesson",
+]
+
+# harus sama persis dengan SearchVector di lms/search.py supaya index terpakai
+POSTGRES_INDEXES = {
+    "Course": ("course_search_idx", ("title", "description")),
+    "Lesson": ("lesson_search_idx", ("title", "content")),
+}
+
+
+def _postgres_index(name, fields):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector(*fields, config="simple"), name=name)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+        for sql in SQLITE_BACKFILL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        for model_name, (name, fields) in POSTGRES_INDEXES.items():
+            schema_editor.add_index(apps.get_model("lms", model_name), _postgres_index(name, fields))
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS lms_search")
+    elif vendor == "postgresql":
+        for model_name, (name, fields) in POSTGRES_INDEXES.items():
+            schema_editor.remove_index(apps.get_model("lms", model_name), _postgres_index(name, fields))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0003_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+from django.db import migrations, models
+from django.db.models import Case, Count, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+
+def _subquery(qs, fk, aggregate):
+    return Coalesce(
+        Subquery(
+            qs.filter(**{fk: OuterRef("pk")}).order_by()
+            .values(fk).annotate(value=aggregate).values("value")
+        ),
+        0,
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    # isi awal agregat dari data yang sudah ada, satu UPDATE per tabel
+    Course = apps.get_model("lms", "Course")
+    Lesson = apps.get_model("lms", "Lesson")
+    Assignment = apps.get_model("lms", "Assignment")
+    Submission = apps.get_model("lms", "Submission")
+    using = schema_editor.connection.alias
+
+    Course.objects.using(using).update(
+        lesson_count=_subquery(Lesson.objects.using(using), "course", Count("pk")),
+        assignment_count=_subquery(Assignment.objects.using(using), "course", Count("pk")),
+    )
+    graded = Submission.objects.using(using).filter(grade__isnull=False)
+    Assignment.objects.using(using).update(
+        submission_count=_subquery(Submission.objects.using(using), "assignment", Count("pk")),
+        graded_count=_subquery(graded, "assignment", Count("pk")),
+        grade_sum=_subquery(graded, "assignment", Sum("grade")),
+    )
+    # kolom di atas sudah terisi: rata-rata dihitung dari nilai barunya
+    Assignment.objects.using(using).update(
+        average_grade=Case(
+            When(GreaterThan(models.F("graded_count"), 0),
+                 then=Cast(models.F("grade_sum"), FloatField()) / models.F("graded_count")),
+            default=Value(None),
+            output_field=FloatField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='average_grade',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='grade_sum',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='graded_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='submission_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='assignment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
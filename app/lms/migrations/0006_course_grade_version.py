@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0005_aggregate_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='grade_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0006_course_grade_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['deadline', 'id'], name='assignment_deadline_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='assignment',
+            name='assignment_deadline_idx',
+        ),
+    ]
@@ -2,6 +2,26 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 
 
+class AggregateFieldsMixin:
+    """
+    Kolom di AGGREGATE_FIELDS hanya diubah lewat UPDATE F() (counters.py).
+    save() pada objek yang sudah ada tidak menulisnya, supaya nilai lama yang
+    ter-load (mis. form admin) tidak menimpa increment dari request lain.
+    """
+
+    AGGREGATE_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.AGGREGATE_FIELDS
+                and f.attname not in deferred
+            ]
+        return super().save(*args, **kwargs)
+
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ("admin", "Admin"),
@@ -14,7 +34,9 @@ class User(AbstractUser):
         return f"{self.username} ({self.role})"
 
 
-class Course(models.Model):
+class Course(AggregateFieldsMixin, models.Model):
+    AGGREGATE_FIELDS = ("lesson_count", "assignment_count", "grade_version")
+
     title = models.CharField(max_length=200, db_index=True)
     description = models.TextField()
     instructor = models.ForeignKey(
@@ -22,6 +44,18 @@ class Course(models.Model):
     )
     # ✅ WAJIB UAS
     created_at = models.DateTimeField(auto_now_add=True)
+    # agregat yang di-maintain incremental (counters.py), perbaiki drift dengan
+    # `manage.py recount_aggregates`
+    lesson_count = models.PositiveIntegerField(default=0, editable=False)
+    assignment_count = models.PositiveIntegerField(default=0, editable=False)
+    # naik setiap ada perubahan nilai/assignment di course ini -> versi cache gradebook
+    grade_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # courses per dosen, terbaru dulu
+            models.Index(fields=["instructor", "-created_at"], name="course_instructor_created_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -32,16 +66,38 @@ class Lesson(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            # /lessons?course_id=: filter + keyset cursor pada id
+            models.Index(fields=["course", "id"], name="lesson_course_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.course.title} - {self.title}"
 
 
-class Assignment(models.Model):
+class Assignment(AggregateFieldsMixin, models.Model):
+    AGGREGATE_FIELDS = ("submission_count", "graded_count", "grade_sum", "average_grade")
+
     course = models.ForeignKey(
         Course, on_delete=models.CASCADE, related_name="assignments"
     )
     title = models.CharField(max_length=200)
     deadline = models.DateTimeField()
+    # agregat submission (counters.py): average_grade = grade_sum / graded_count
+    submission_count = models.PositiveIntegerField(default=0, editable=False)
+    graded_count = models.PositiveIntegerField(default=0, editable=False)
+    grade_sum = models.BigIntegerField(default=0, editable=False)
+    average_grade = models.FloatField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # assignments per course urut deadline
+            models.Index(fields=["course", "deadline"], name="assignment_course_deadline_idx"),
+            # /assignments?deadline_after=&deadline_before= lintas course: page
+            # urut (deadline, id) dengan cursor keyset (pagination.py key=)
+            models.Index(fields=["deadline", "id"], name="assignment_deadline_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
@@ -59,5 +115,28 @@ class Submission(models.Model):
     file = models.FileField(upload_to="submissions/", null=True, blank=True)
     grade = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # /submissions?student_id= (dan filter otomatis mahasiswa) + cursor id
+            models.Index(fields=["student", "id"], name="submission_student_id_idx"),
+            # /submissions?assignment_id= + cursor id
+            models.Index(fields=["assignment", "id"], name="submission_assignment_id_idx"),
+        ]
+        constraints = [
+            # satu submission per mahasiswa per assignment; juga jadi index
+            # untuk lookup (assignment) dan (assignment, student)
+            models.UniqueConstraint(
+                fields=["assignment", "student"], name="submission_assignment_student_uniq"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "grade" in field_names:
+            # grade yang sudah tercatat di agregat Assignment (signals/counters)
+            instance._counted_grade = instance.grade
+        return instance
+
     def __str__(self):
         return f"{self.student.username} -> {self.assignment.title}"
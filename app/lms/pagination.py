@@ -0,0 +1,125 @@
+import base64
+import binascii
+from typing import Iterable, Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from ninja.errors import HttpError
+
+# ======================
+# KEYSET (CURSOR) PAGINATION + FIELD PROJECTION
+# Default urut primary key. key="deadline" -> urut (deadline, pk) dan cursor
+# membawa keduanya: filter range pada key tetap dilayani index (key, id)
+# tanpa scan + sort seluruh tabel.
+# ======================
+PAGE_DEFAULT_LIMIT = 50
+PAGE_MAX_LIMIT = 200
+
+
+def encode_cursor(pk, key_value=None) -> str:
+    if key_value is not None:
+        value = key_value.isoformat() if hasattr(key_value, "isoformat") else key_value
+        pk = f"{value}|{pk}"
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(_decode(cursor))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HttpError(400, "Invalid cursor")
+
+
+def decode_key_cursor(cursor: str, field) -> tuple:
+    """Cursor (key, pk) -> (nilai key sesuai tipe `field`, pk)."""
+    try:
+        value, pk = _decode(cursor).rsplit("|", 1)
+        return field.to_python(value), int(pk)
+    except (ValueError, ValidationError, binascii.Error, UnicodeDecodeError):
+        raise HttpError(400, "Invalid cursor")
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> list[str]:
+    """`fields=id,title` -> kolom untuk .values(); `id` selalu ikut (dipakai cursor)."""
+    allowed = list(allowed)
+    if not fields:
+        return allowed
+
+    columns = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in columns:
+            continue
+        if name not in allowed:
+            raise HttpError(400, f"Unknown field: {name}")
+        columns.append(name)
+    return columns
+
+
+def clamp_limit(limit: int) -> int:
+    if limit < 1:
+        raise HttpError(400, "limit must be >= 1")
+    return min(limit, PAGE_MAX_LIMIT)
+
+
+def _page_queryset(qs, *, limit, cursor, fields, allowed, descending, extra=(), key=None):
+    """Return (queryset page, limit, kolom key yang hanya ikut untuk cursor)."""
+    # extra = kolom tambahan di luar projection (mis. join instructor__username)
+    columns = parse_fields(fields, allowed) + [c for c in extra if c]
+    limit = clamp_limit(limit)
+    hidden = None
+    if key is not None and key not in columns:
+        hidden = key
+        columns.append(key)
+
+    order = [key, "pk"] if key else ["pk"]
+    qs = qs.order_by(*(f"-{c}" if descending else c for c in order))
+    if cursor:
+        op = "lt" if descending else "gt"
+        if key is None:
+            qs = qs.filter(**{f"pk__{op}": decode_cursor(cursor)})
+        else:
+            value, last = decode_key_cursor(cursor, qs.model._meta.get_field(key))
+            qs = qs.filter(Q(**{f"{key}__{op}": value}) | Q(**{key: value, f"pk__{op}": last}))
+
+    # ambil limit+1 baris supaya tahu masih ada page berikutnya tanpa COUNT(*)
+    return qs.values(*columns)[: limit + 1], limit, hidden
+
+
+def _page_result(rows, limit, key=None, hidden=None) -> dict:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["id"], last[key] if key else None)
+    if hidden:
+        for row in rows:
+            del row[hidden]
+    return {"items": rows, "next": next_cursor}
+
+
+def paginate(qs, *, limit: int, cursor: Optional[str], fields: Optional[str],
+             allowed: Iterable[str], descending: bool = False, extra: Iterable[str] = (),
+             key: Optional[str] = None) -> dict:
+    """Satu page berurutan pada (key,) primary key: {"items": [...], "next": <cursor|None>}."""
+    page_qs, limit, hidden = _page_queryset(
+        qs, limit=limit, cursor=cursor, fields=fields, allowed=allowed,
+        descending=descending, extra=extra, key=key,
+    )
+    return _page_result(list(page_qs), limit, key, hidden)
+
+
+async def apaginate(qs, *, limit: int, cursor: Optional[str], fields: Optional[str],
+                    allowed: Iterable[str], descending: bool = False,
+                    extra: Iterable[str] = (), key: Optional[str] = None) -> dict:
+    """Versi async dari paginate() untuk endpoint ASGI."""
+    page_qs, limit, hidden = _page_queryset(
+        qs, limit=limit, cursor=cursor, fields=fields, allowed=allowed,
+        descending=descending, extra=extra, key=key,
+    )
+    return _page_result([row async for row in page_qs], limit, key, hidden)
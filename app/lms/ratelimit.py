@@ -0,0 +1,236 @@
+import functools
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from ninja.errors import HttpError
+
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# ======================
+# RATE LIMITING (atomic check-and-increment)
+# - Redis: satu EVALSHA Lua per hit, tidak ada race read-then-write
+# - Local: fallback in-process untuk test/dev tanpa Redis
+# ======================
+RATE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, limit - count - 1, 0}
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, 0, window - (now - tonumber(oldest[2]))}
+"""
+
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local refill = tonumber(ARGV[3])
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * refill)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = math.ceil((1 - tokens) / refill)
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(capacity / refill))
+return {allowed, math.floor(tokens), retry}
+"""
+
+
+class RateLimited(HttpError):
+    def __init__(self, message, retry_after: int):
+        super().__init__(429, message)
+        self.retry_after = retry_after
+
+
+def parse_rate(rate: str):
+    """"5/m", "5/60s", "100/h" -> (limit, period dalam detik)."""
+    count, period = rate.split("/")
+    unit = period[-1]
+    amount = int(period[:-1]) if len(period) > 1 else 1
+    return int(count), amount * RATE_UNITS[unit]
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class RedisBackend:
+    def __init__(self, client):
+        self.client = client
+        self.scripts = {
+            "sliding": client.register_script(SLIDING_WINDOW_LUA),
+            "token_bucket": client.register_script(TOKEN_BUCKET_LUA),
+        }
+
+    def hit(self, key, policy, limit, period):
+        window_ms = period * 1000
+        if policy == "sliding":
+            args = [_now_ms(), window_ms, limit, f"{_now_ms()}-{uuid.uuid4().hex[:8]}"]
+        else:
+            args = [_now_ms(), limit, limit / window_ms]
+        allowed, remaining, retry_ms = self.scripts[policy](keys=[key], args=args)
+        return bool(allowed), int(remaining), int(retry_ms)
+
+    def reset(self, key):
+        self.client.delete(key)
+
+
+class LocalBackend:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._buckets = {}
+
+    def hit(self, key, policy, limit, period):
+        now = _now_ms()
+        window_ms = period * 1000
+        with self._lock:
+            if policy == "sliding":
+                hits = self._windows.setdefault(key, deque())
+                while hits and hits[0] <= now - window_ms:
+                    hits.popleft()
+                if len(hits) < limit:
+                    hits.append(now)
+                    return True, limit - len(hits), 0
+                return False, 0, window_ms - (now - hits[0])
+
+            refill = limit / window_ms
+            tokens, ts = self._buckets.get(key, (limit, now))
+            tokens = min(limit, tokens + (now - ts) * refill)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, int(tokens - 1), 0
+            self._buckets[key] = (tokens, now)
+            return False, 0, math.ceil((1 - tokens) / refill)
+
+    def reset(self, key):
+        with self._lock:
+            self._windows.pop(key, None)
+            self._buckets.pop(key, None)
+
+
+class NullBackend:
+    """LMS_RATELIMIT_ENABLED=False (load test): semua request lolos."""
+
+    def hit(self, key, policy, limit, period):
+        return True, limit, 0
+
+    def reset(self, key):
+        pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                alias = getattr(settings, "LMS_RATELIMIT_CACHE", "redis")
+                if not getattr(settings, "LMS_RATELIMIT_ENABLED", True):
+                    _backend = NullBackend()
+                    return _backend
+                try:
+                    from django_redis import get_redis_connection
+                    _backend = RedisBackend(get_redis_connection(alias))
+                except (ImportError, NotImplementedError):
+                    logger.info("Rate limit: cache %r bukan Redis, pakai LocalBackend", alias)
+                    _backend = LocalBackend()
+    return _backend
+
+
+class RateLimit:
+    """
+    Satu policy rate limit, mis. RateLimit("login:ip", "5/m").
+    policy: "sliding" (sliding window log) atau "token_bucket".
+    """
+
+    def __init__(self, scope: str, rate: str, policy: str = "sliding"):
+        if policy not in ("sliding", "token_bucket"):
+            raise ValueError(f"Unknown rate limit policy: {policy}")
+        self.scope = scope
+        self.policy = policy
+        self.limit, self.period = parse_rate(rate)
+
+    def key(self, identity) -> str:
+        return f"rl:{self.scope}:{identity}"
+
+    def hit(self, identity):
+        """Cek + tambah counter dalam satu round trip. Return (allowed, remaining, retry_ms)."""
+        started = time.perf_counter()
+        result = get_backend().hit(self.key(identity), self.policy, self.limit, self.period)
+        record_cache(f"rl:{self.scope}", "allowed" if result[0] else "limited",
+                     time.perf_counter() - started)
+        return result
+
+    def check(self, identity, message="Too many requests. Try again later."):
+        allowed, _, retry_ms = self.hit(identity)
+        if not allowed:
+            raise RateLimited(message, retry_after=max(1, math.ceil(retry_ms / 1000)))
+
+    def reset(self, identity):
+        get_backend().reset(self.key(identity))
+
+
+def client_ip(request):
+    xff = request.META.get("HTTP_X_FORWARDED_FOR")
+    if xff:
+        return xff.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "unknown")
+
+
+def _identity(request, key):
+    if callable(key):
+        return key(request)
+    if key == "user":
+        user = getattr(request, "user", None)
+        return getattr(user, "id", None) or client_ip(request)
+    return client_ip(request)
+
+
+def rate_limit(scope: str, rate: str, key="ip", policy: str = "sliding"):
+    """
+    Decorator endpoint Ninja (taruh di bawah @router.xxx):
+
+        @router.post("/register")
+        @rate_limit("register", "10/h")
+        def register(request, ...): ...
+
+    key: "ip", "user" (request.user.id, setelah auth) atau callable(request).
+    """
+    limiter = RateLimit(scope, rate, policy)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limiter.check(_identity(request, key))
+            return view(request, *args, **kwargs)
+        wrapper.rate_limit = limiter
+        return wrapper
+
+    return decorator
@@ -0,0 +1,69 @@
+import json
+import time
+from datetime import datetime
+
+from ninja.parser import Parser
+from ninja.renderers import JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # opsional: tanpa orjson pakai json stdlib
+    orjson = None
+
+# ======================
+# JSON ENCODE / DECODE
+# orjson kalau ter-install, fallback json stdlib. Nilai yang dihasilkan sama
+# dengan NinjaJSONEncoder: datetime/date/time lewat OPT_PASSTHROUGH_DATETIME
+# supaya formatnya tetap "2024-01-01T10:00:00.123Z" (ms, bukan mikrodetik),
+# Decimal/Promise/pydantic juga lewat encoder yang sama. Bedanya hanya
+# whitespace dan non-ASCII (UTF-8 langsung, bukan \uXXXX).
+# ======================
+_ninja_default = NinjaJSONEncoder().default
+
+
+def _default(obj):
+    # datetime paling sering muncul (created_at, deadline): format sama dengan
+    # DjangoJSONEncoder tanpa rantai isinstance NinjaJSONEncoder
+    if type(obj) is datetime:
+        value = obj.isoformat(timespec="milliseconds") if obj.microsecond else obj.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    return _ninja_default(obj)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def json_dumps(data) -> bytes:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+    def json_loads(raw):
+        return orjson.loads(raw)
+
+else:
+
+    def json_dumps(data) -> bytes:
+        return json.dumps(data, cls=NinjaJSONEncoder).encode()
+
+    def json_loads(raw):
+        return json.loads(raw)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """Renderer NinjaAPI: json_dumps() + waktu encode dicatat ke metrics request."""
+
+    def render(self, request, data, *, response_status):
+        started = time.perf_counter()
+        try:
+            return json_dumps(data)
+        finally:
+            metrics.record_serialization(time.perf_counter() - started)
+
+
+class FastJSONParser(Parser):
+    """Body request JSON lewat json_loads() (orjson kalau ada)."""
+
+    def parse_body(self, request):
+        return json_loads(request.body)
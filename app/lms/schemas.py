@@ -1,7 +1,10 @@
 from ninja import Schema
+from pydantic import ConfigDict
 from datetime import datetime
 from typing import Optional
 
+from .downloads import submission_file_url
+
 
 class UserSchema(Schema):
     id: int
@@ -25,6 +28,33 @@ class CourseSchema(Schema):
     instructor_id: int
     # ✅ WAJIB UAS: created_at
     created_at: datetime
+    # kolom agregat (counters.py), ikut terbaca di query yang sama
+    lesson_count: int = 0
+    assignment_count: int = 0
+
+
+# Course detail: instructor + lesson/assignment ringkas dalam satu response
+class InstructorSchema(Schema):
+    id: int
+    username: str
+    role: str
+
+
+class LessonSummarySchema(Schema):
+    id: int
+    title: str
+
+
+class AssignmentSummarySchema(Schema):
+    id: int
+    title: str
+    deadline: datetime
+
+
+class CourseDetailSchema(CourseSchema):
+    instructor: InstructorSchema
+    lessons: list[LessonSummarySchema]
+    assignments: list[AssignmentSummarySchema]
 
 
 class CourseCreateSchema(Schema):
@@ -51,6 +81,9 @@ class AssignmentSchema(Schema):
     title: str
     deadline: datetime
     course_id: int
+    submission_count: int = 0
+    graded_count: int = 0
+    average_grade: Optional[float] = None
 
 
 class AssignmentCreateSchema(Schema):
@@ -65,13 +98,81 @@ class SubmissionSchema(Schema):
     grade: int | None
     student_id: int
     assignment_id: int
-    
+    # URL download terproteksi (GET /submissions/{id}/file), sama dengan page list
     file: Optional[str] = None
 
+    @staticmethod
+    def resolve_file(obj):
+        return submission_file_url(obj.id, obj.file.name if obj.file else None)
+
 
 class SubmissionCreateSchema(Schema):
+    # file hanya lewat chunked upload (finalize); path dari client (mis. "file")
+    # ditolak 422, bukan diam-diam diabaikan
+    model_config = ConfigDict(extra="forbid")
+
     answer: str
     student_id: int
     assignment_id: int
-    # optional: kalau nanti kamu bikin endpoint upload, field ini bisa dipakai sebagai path
-    file: Optional[str] = None
+
+
+# Chunked upload Submission.file: sha256 opsional, diverifikasi saat finalize
+class UploadCreateSchema(Schema):
+    filename: str
+    size: int
+    sha256: Optional[str] = None
+
+
+class UploadStatusSchema(Schema):
+    upload_id: str
+    submission_id: int
+    filename: str
+    size: int
+    offset: int
+    chunk_size: int
+    complete: bool
+
+
+# Cursor pagination: items hasil projection `fields=`, next = cursor page berikutnya
+class PageSchema(Schema):
+    items: list[dict]
+    next: Optional[str] = None
+
+
+# Bulk import: row = index di array JSON (mulai 0) atau nomor baris CSV
+class BulkErrorSchema(Schema):
+    row: int
+    error: str
+
+
+class BulkResultSchema(Schema):
+    created: int
+    ids: list[int]
+    errors: list[BulkErrorSchema]
+
+
+# Bulk grading: grade None = kosongkan nilai
+class GradeSchema(Schema):
+    submission_id: int
+    grade: Optional[int] = None
+
+
+class GradeRowResultSchema(Schema):
+    row: int
+    submission_id: Optional[int] = None
+    status: str  # updated | not_found | invalid
+    error: Optional[str] = None
+
+
+class GradeResultSchema(Schema):
+    updated: int
+    results: list[GradeRowResultSchema]
+
+
+# Full-text search: score makin besar makin relevan
+class SearchHitSchema(Schema):
+    kind: str  # course | lesson
+    id: int
+    course_id: int
+    title: str
+    score: float
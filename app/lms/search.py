@@ -0,0 +1,216 @@
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Course, Lesson
+
+# ======================
+# FULL-TEXT SEARCH (courses + lessons)
+# - SQLite: satu tabel virtual FTS5 `lms_search`, di-update incremental lewat
+#   signal (signals.py) dan bulk import (bulk.py)
+# - PostgreSQL: expression GIN index to_tsvector(...) per tabel
+#   (migrations/0004_search_index.py), otomatis ikut ter-update oleh DB
+# ======================
+SEARCH_TABLE = "lms_search"
+SEARCH_CONFIG = "simple"   # tanpa stemming: cocok untuk teks campuran ID/EN
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+SEARCH_MAX_TERMS = 8
+
+# kind -> model + kolom dokumen; rowid FTS = pk * 2 + offset kind
+SEARCH_MODELS = {
+    "course": (Course, ("title", "description")),
+    "lesson": (Lesson, ("title", "content")),
+}
+_ROWID_OFFSET = {"course": 0, "lesson": 1}
+_KIND_OF_MODEL = {model: kind for kind, (model, _) in SEARCH_MODELS.items()}
+
+
+def _rowid(kind, pk):
+    return pk * 2 + _ROWID_OFFSET[kind]
+
+
+def search_terms(q: str) -> list[str]:
+    # hanya karakter kata: aman dipakai di ekspresi MATCH / to_tsquery
+    return re.findall(r"\w+", (q or "").lower())[:SEARCH_MAX_TERMS]
+
+
+def _course_id(kind, obj):
+    return obj.pk if kind == "course" else obj.course_id
+
+
+# ---------- write side (SQLite saja; Postgres di-handle index DB) ----------
+def index_objects(model, objs):
+    """Upsert dokumen search untuk objek Course/Lesson yang baru disimpan."""
+    kind = _KIND_OF_MODEL.get(model)
+    conn = connections[router.db_for_write(model)]
+    if kind is None or conn.vendor != "sqlite" or not objs:
+        return
+    _, (title, body) = SEARCH_MODELS[kind]
+    rows = [
+        (_rowid(kind, o.pk), kind, _course_id(kind, o), getattr(o, title), getattr(o, body))
+        for o in objs
+    ]
+    with conn.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(r[0],) for r in rows])
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, course_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_objects(model, pks):
+    kind = _KIND_OF_MODEL.get(model)
+    conn = connections[router.db_for_write(model)]
+    if kind is None or conn.vendor != "sqlite" or not pks:
+        return
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(_rowid(kind, pk),) for pk in pks]
+        )
+
+
+def rebuild_index(using="default"):
+    """Bangun ulang tabel FTS dari tabel sumber. Return jumlah dokumen (SQLite)."""
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return None
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        for kind, (model, (title, body)) in SEARCH_MODELS.items():
+            course = "id" if kind == "course" else "course_id"
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, kind, course_id, title, body) "
+                f"SELECT id * 2 + {_ROWID_OFFSET[kind]}, %s, {course}, {title}, {body} "
+                f"FROM {model._meta.db_table}",
+                [kind],
+            )
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+# ---------- read side ----------
+def _fts_match(terms, prefix, column=None):
+    # "a" "b"* = AND implisit, term terakhir sebagai prefix (autocomplete)
+    parts = [f'"{t}"' for t in terms]
+    if prefix:
+        parts[-1] += "*"
+    expr = " ".join(parts)
+    return f"{column} : ({expr})" if column else expr
+
+
+def _sqlite_search(conn, terms, kinds, limit, prefix, column=None):
+    # bm25: kolom kind, course_id tidak diindex; title 10x lebih berbobot dari body
+    sql = (
+        f"SELECT rowid, kind, course_id, title, bm25({SEARCH_TABLE}, 0, 0, 10.0, 1.0) AS score "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+    )
+    params = [_fts_match(terms, prefix, column)]
+    if len(kinds) == 1:
+        sql += " AND kind = %s"
+        params.append(kinds[0])
+    sql += " ORDER BY score LIMIT %s"
+    params.append(limit)
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {"kind": kind, "id": rowid // 2, "course_id": course_id, "title": title,
+             "score": -score}
+            for rowid, kind, course_id, title, score in cursor.fetchall()
+        ]
+
+
+def _postgres_query(terms, prefix):
+    from django.contrib.postgres.search import SearchQuery
+
+    raw = " & ".join(terms)
+    if prefix:
+        raw += ":*"
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+def _postgres_vector(fields):
+    from django.contrib.postgres.search import SearchVector
+
+    # ekspresi harus identik dengan GIN index di migration 0004
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def _postgres_search(using, terms, kinds, limit, prefix):
+    from django.contrib.postgres.search import SearchRank
+
+    query = _postgres_query(terms, prefix)
+    hits = []
+    for kind in kinds:
+        model, fields = SEARCH_MODELS[kind]
+        vector = _postgres_vector(fields)
+        course = "id" if kind == "course" else "course_id"
+        rows = (
+            model.objects.using(using)
+            .annotate(document=vector)
+            .filter(document=query)
+            .annotate(score=SearchRank(vector, query))
+            .order_by("-score")
+            .values_list("id", course, "title", "score")[:limit]
+        )
+        hits.extend(
+            {"kind": kind, "id": pk, "course_id": course_id, "title": title, "score": score}
+            for pk, course_id, title, score in rows
+        )
+    hits.sort(key=lambda h: h["score"], reverse=True)
+    return hits[:limit]
+
+
+def search(q: str, kind=None, limit=SEARCH_DEFAULT_LIMIT, prefix=False):
+    """Hit terurut relevansi: [{"kind", "id", "course_id", "title", "score"}]."""
+    terms = search_terms(q)
+    if not terms:
+        return []
+    kinds = [kind] if kind else list(SEARCH_MODELS)
+    using = router.db_for_read(Course)
+    conn = connections[using]
+    if conn.vendor == "sqlite":
+        return _sqlite_search(conn, terms, kinds, limit, prefix)
+    # database_config() hanya menghasilkan sqlite / postgresql
+    return _postgres_search(using, terms, kinds, limit, prefix)
+
+
+def autocomplete(q: str, kind=None, limit=SEARCH_DEFAULT_LIMIT):
+    """Saran judul untuk teks yang sedang diketik (term terakhir = prefix)."""
+    terms = search_terms(q)
+    if not terms:
+        return []
+    conn = connections[router.db_for_read(Course)]
+    if conn.vendor == "sqlite":
+        # prefix index FTS5 (prefix='2 3 4'), hanya kolom title
+        kinds = [kind] if kind else list(SEARCH_MODELS)
+        return _sqlite_search(conn, terms, kinds, limit, prefix=True, column="title")
+    return search(q, kind=kind, limit=limit, prefix=True)
+
+
+def match_filter(model, q: str):
+    """
+    Q(pk__in=<subquery>) untuk semua hit full-text satu model (admin
+    changelist). MATCH / tsvector berjalan di query yang sama: tidak ada daftar
+    id di Python dan tidak ada batas jumlah hit. None kalau q tanpa term.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None
+    kind = _KIND_OF_MODEL[model]
+    if connections[router.db_for_read(model)].vendor == "sqlite":
+        # rowid = pk * 2 + offset kind (_rowid), jadi pk = rowid / 2
+        return Q(pk__in=RawSQL(
+            f"SELECT rowid / 2 FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND kind = %s",
+            (_fts_match(terms, prefix=False), kind),
+        ))
+    _, fields = SEARCH_MODELS[kind]
+    matches = (
+        model.objects.annotate(document=_postgres_vector(fields))
+        .filter(document=_postgres_query(terms, prefix=False))
+        .values("pk")
+    )
+    return Q(pk__in=matches)
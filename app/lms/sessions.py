@@ -0,0 +1,155 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.db import close_old_connections, router, transaction
+
+logger = logging.getLogger(__name__)
+
+# ======================
+# WRITE-BEHIND SESSION STORE
+# SESSION_ENGINE = "lms.sessions": baca/tulis ke cache (Redis) seperti
+# cached_db, tapi penulisan ke tabel django_session di-batch oleh satu thread
+# per worker (upsert tiap FLUSH_INTERVAL detik / FLUSH_BATCH session).
+# Redis di-flush -> session dibaca ulang dari DB, user tidak ter-logout.
+# Trade-off: perubahan session < FLUSH_INTERVAL terakhir hilang kalau worker crash.
+# ======================
+FLUSH_INTERVAL = getattr(settings, "LMS_SESSION_FLUSH_INTERVAL", 1.0)  # detik
+FLUSH_BATCH = getattr(settings, "LMS_SESSION_FLUSH_BATCH", 500)
+
+
+class SessionWriter:
+    """Antrian tulis session -> DB. Entry per key: (data, expire_date) atau None (hapus)."""
+
+    def __init__(self, interval=FLUSH_INTERVAL, batch_size=FLUSH_BATCH):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+
+    def _ensure_thread(self):
+        # thread tidak ikut ter-fork (gunicorn --preload): start ulang per pid
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._pending = {}
+            threading.Thread(target=self._run, name="lms-session-writer", daemon=True).start()
+            atexit.register(self.flush)
+
+    def enqueue(self, session_key, value):
+        self._ensure_thread()
+        with self._lock:
+            # hanya state terakhir per session yang perlu ditulis
+            self._pending.pop(session_key, None)
+            self._pending[session_key] = value
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        from django.contrib.sessions.models import Session
+
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        saves = [
+            Session(session_key=key, session_data=value[0], expire_date=value[1])
+            for key, value in batch.items() if value is not None
+        ]
+        deletes = [key for key, value in batch.items() if value is None]
+        using = router.db_for_write(Session)
+        try:
+            with transaction.atomic(using=using):
+                if deletes:
+                    Session.objects.using(using).filter(session_key__in=deletes).delete()
+                if saves:
+                    Session.objects.using(using).bulk_create(
+                        saves, batch_size=self.batch_size, update_conflicts=True,
+                        unique_fields=["session_key"],
+                        update_fields=["session_data", "expire_date"],
+                    )
+        except Exception:
+            # DB sedang bermasalah: kembalikan ke antrian kecuali sudah ada versi baru
+            logger.exception("Session write-behind flush failed, retrying later")
+            with self._lock:
+                for key, value in batch.items():
+                    self._pending.setdefault(key, value)
+            return 0
+        finally:
+            close_old_connections()
+        return len(batch)
+
+
+writer = SessionWriter()
+
+
+def flush_sessions() -> int:
+    """Tulis semua session yang masih antre ke DB sekarang (test, shutdown)."""
+    return writer.flush()
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = "lms.sessions"
+
+    def _write_cache(self, data, must_create):
+        key = self.cache_key
+        if must_create:
+            # key random 32 char: cache.add cukup untuk deteksi bentrok
+            if not self._cache.add(key, data, self.get_expiry_age()):
+                raise CreateError
+        else:
+            self._cache.set(key, data, self.get_expiry_age())
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        self._write_cache(data, must_create)
+        writer.enqueue(self.session_key, (self.encode(data), self.get_expiry_date()))
+
+    async def asave(self, must_create=False):
+        if self.session_key is None:
+            return await self.acreate()
+        data = await self._aget_session(no_load=must_create)
+        key = await self.acache_key()
+        expiry = await self.aget_expiry_age()
+        if must_create:
+            if not await self._cache.aadd(key, data, expiry):
+                raise CreateError
+        else:
+            await self._cache.aset(key, data, expiry)
+        writer.enqueue(self.session_key, (self.encode(data), await self.aget_expiry_date()))
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._cache.delete(self.cache_key_prefix + session_key)
+        writer.enqueue(session_key, None)
+
+    async def adelete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        await self._cache.adelete(self.cache_key_prefix + session_key)
+        writer.enqueue(session_key, None)
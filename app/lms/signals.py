@@ -0,0 +1,112 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import counters
+from .auth import revoke_tokens
+from .cache import invalidate_course_cache
+from .models import User, Course, Lesson, Assignment, Submission
+from .search import index_objects, unindex_objects
+
+
+# role berubah / user dinonaktifkan / dihapus -> versi token naik: token lama
+# 401 dan principal ter-cache basi di semua worker (auth.py)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, created=False, update_fields=None, **kwargs):
+    # user baru belum punya token; login admin hanya menyimpan last_login
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    revoke_tokens(instance.pk)
+
+
+# course berubah lewat API maupun admin -> semua page /courses jadi basi
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_courses(sender, instance, **kwargs):
+    invalidate_course_cache()
+
+
+# /courses?include= dan /courses/{id} meng-embed lesson & assignment
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+def invalidate_course_children(sender, instance, **kwargs):
+    invalidate_course_cache()
+
+
+# index full-text (SQLite FTS5) di-update dalam transaksi yang sama
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+def index_search_document(sender, instance, **kwargs):
+    index_objects(sender, [instance])
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+def unindex_search_document(sender, instance, **kwargs):
+    unindex_objects(sender, [instance.pk])
+
+
+# ======================
+# AGREGAT COURSE / ASSIGNMENT (counters.py)
+# ======================
+def _deleted_with(origin, *models):
+    # origin = objek/queryset yang memulai delete(); cascade dari parent yang
+    # ikut terhapus tidak perlu meng-update counter parent tersebut
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=Assignment)
+def count_course_child_created(sender, instance, created, **kwargs):
+    if created:
+        counters.bump_course(sender, {instance.course_id: 1})
+    elif sender is Assignment:
+        # judul/deadline tampil di header gradebook
+        counters.bump_grade_version(course_id=instance.course_id)
+
+
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=Assignment)
+def count_course_child_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleted_with(origin, Course):
+        counters.bump_course(sender, {instance.course_id: -1})
+
+
+@receiver(pre_save, sender=Submission)
+def load_counted_grade(sender, instance, update_fields=None, **kwargs):
+    # grade lama dibutuhkan untuk delta; normalnya sudah ada dari from_db(),
+    # query hanya kalau instance di-load dengan grade di-defer
+    if instance._state.adding or hasattr(instance, "_counted_grade"):
+        return
+    if update_fields is not None and "grade" not in update_fields:
+        return
+    instance._counted_grade = (
+        Submission.objects.filter(pk=instance.pk).values_list("grade", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Submission)
+def count_submission_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and update_fields is not None and "grade" not in update_fields:
+        return
+    old = None if created else instance._counted_grade
+    graded, grade_sum = counters.grade_delta(old, instance.grade)
+    counters.bump_assignment(
+        instance.assignment_id, submissions=int(created), graded=graded, grade_sum=grade_sum,
+        regraded=old != instance.grade,
+    )
+    instance._counted_grade = instance.grade
+
+
+@receiver(post_delete, sender=Submission)
+def count_submission_deleted(sender, instance, origin=None, **kwargs):
+    if _deleted_with(origin, Course, Assignment):
+        return
+    graded, grade_sum = counters.grade_delta(instance.grade, None)
+    counters.bump_assignment(
+        instance.assignment_id, submissions=-1, graded=graded, grade_sum=grade_sum
+    )
@@ -0,0 +1,279 @@
+import contextlib
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+from ninja.errors import HttpError
+
+from .lru import TTLCache
+
+# ======================
+# CHUNKED + RESUMABLE UPLOAD (Submission.file)
+# - tiap upload: <LMS_UPLOAD_PARTIAL_DIR>/<id>.part (data) + <id>.json (metadata)
+#   + <id>.lock; folder partial di luar MEDIA_ROOT (media bisa disajikan publik)
+# - offset = ukuran file .part, jadi setelah putus cukup tanya offset lalu lanjut
+# - chunk di-stream ke disk per UPLOAD_BUFFER_SIZE (maks UPLOAD_CHUNK_SIZE per
+#   PUT); memori per upload konstan
+# - SHA-256 dihitung sambil menulis; finalize memindahkan file ke
+#   submissions/sha256/<2 hex>/<digest><ext>, isi yang sama disimpan sekali
+# - write/finalize/abort antre di flock <id>.lock; finalize idempoten: metadata
+#   menyimpan nama file final, finalize ulang mengembalikan hasil yang sama
+# ======================
+UPLOAD_MAX_SIZE = getattr(settings, "LMS_UPLOAD_MAX_SIZE", 200 * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = getattr(settings, "LMS_UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024)
+UPLOAD_EXPIRY = getattr(settings, "LMS_UPLOAD_EXPIRY", 24 * 3600)  # detik
+UPLOAD_BUFFER_SIZE = 64 * 1024
+UPLOAD_DIR = "submissions"
+PARTIAL_DIR = getattr(settings, "LMS_UPLOAD_PARTIAL_DIR", None) or os.path.join(
+    settings.BASE_DIR, "upload_partial"
+)
+DEDUP_DIR = f"{UPLOAD_DIR}/sha256"
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# state SHA-256 yang sedang berjalan per upload: (offset, hasher). Hanya
+# optimasi per process; kalau hilang (worker lain / restart) di-rebuild dari .part
+_hashers = TTLCache(maxsize=256, ttl=UPLOAD_EXPIRY)
+
+
+def _partial_dir() -> Path:
+    return Path(PARTIAL_DIR)
+
+
+def _paths(upload_id):
+    if not _UPLOAD_ID.match(upload_id):
+        raise HttpError(404, "Upload not found")
+    base = _partial_dir() / upload_id
+    return base.with_suffix(".part"), base.with_suffix(".json")
+
+
+def _write_meta(meta_path, meta):
+    # tulis metadata atomik: tidak pernah ada .json setengah jadi
+    tmp = meta_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, meta_path)
+
+
+def _load_meta(upload_id, user):
+    part, meta_path = _paths(upload_id)
+    try:
+        meta = json.loads(meta_path.read_text())
+    except FileNotFoundError:
+        raise HttpError(404, "Upload not found")
+    if meta["user_id"] != user.id:
+        raise HttpError(404, "Upload not found")
+    return meta, part, meta_path
+
+
+@contextlib.contextmanager
+def _locked(upload_id, user):
+    """
+    flock eksklusif per upload; metadata dibaca ulang setelah lock didapat
+    karena request sebelumnya di antrean bisa sudah finalize / abort.
+    """
+    meta_path = _load_meta(upload_id, user)[2]
+    with open(meta_path.with_suffix(".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield _load_meta(upload_id, user)
+
+
+def _move(source, target):
+    # rename atomik kalau satu filesystem; beda device (folder partial di disk
+    # lain) -> salin ke file sementara di folder tujuan lalu rename
+    try:
+        os.replace(source, target)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        source.unlink()
+
+
+def _status(meta, offset):
+    return {
+        "upload_id": meta["upload_id"],
+        "submission_id": meta["submission_id"],
+        "filename": meta["filename"],
+        "size": meta["size"],
+        "offset": offset,
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "complete": offset == meta["size"],
+    }
+
+
+def _hash_file(path, upto=None):
+    hasher = hashlib.sha256()
+    remaining = upto
+    with open(path, "rb") as fh:
+        while remaining is None or remaining > 0:
+            size = UPLOAD_BUFFER_SIZE if remaining is None else min(UPLOAD_BUFFER_SIZE, remaining)
+            block = fh.read(size)
+            if not block:
+                break
+            hasher.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return hasher
+
+
+def _hasher_at(upload_id, part, offset):
+    state = _hashers.get(upload_id)
+    if state is not None and state[0] == offset:
+        return state[1]
+    return _hash_file(part, offset)
+
+
+def start_upload(submission, user, filename: str, size: int, sha256=None):
+    if size < 1:
+        raise HttpError(400, "size must be >= 1")
+    if size > UPLOAD_MAX_SIZE:
+        raise HttpError(413, f"File too large (max {UPLOAD_MAX_SIZE} bytes)")
+    if sha256 is not None and not re.fullmatch(r"[0-9a-fA-F]{64}", sha256):
+        raise HttpError(400, "sha256 must be 64 hex characters")
+
+    upload_id = uuid.uuid4().hex
+    part, meta_path = _paths(upload_id)
+    part.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "upload_id": upload_id,
+        "submission_id": submission.id,
+        "user_id": user.id,
+        "filename": get_valid_filename(os.path.basename(filename)) or "upload",
+        "size": size,
+        "sha256": sha256.lower() if sha256 else None,
+        "created": time.time(),
+    }
+    part.touch()
+    _write_meta(meta_path, meta)
+    return _status(meta, 0)
+
+
+def upload_status(upload_id, user):
+    meta, part, _ = _load_meta(upload_id, user)
+    if meta.get("name"):
+        return _status(meta, meta["size"])
+    try:
+        return _status(meta, part.stat().st_size)
+    except FileNotFoundError:
+        # finalize / abort selesai di antara baca metadata dan stat
+        meta, _, _ = _load_meta(upload_id, user)
+        if not meta.get("name"):
+            raise HttpError(404, "Upload not found")
+        return _status(meta, meta["size"])
+
+
+def write_chunk(upload_id, user, offset: int, stream, length: int):
+    """
+    Tambahkan `length` byte dari `stream` (request body) di posisi `offset`.
+    Offset harus sama dengan ukuran yang sudah diterima (409 kalau tidak).
+    """
+    if length < 1:
+        raise HttpError(400, "Empty chunk")
+    if length > UPLOAD_CHUNK_SIZE:
+        raise HttpError(413, f"Chunk too large (max {UPLOAD_CHUNK_SIZE} bytes)")
+
+    # satu writer per upload; request paralel untuk upload yang sama antre di sini
+    with _locked(upload_id, user) as (meta, part, _):
+        if meta.get("name"):
+            raise HttpError(409, "Upload already finalized")
+        if offset + length > meta["size"]:
+            raise HttpError(400, "Chunk exceeds declared size")
+        with open(part, "ab") as fh:
+            current = os.fstat(fh.fileno()).st_size
+            if offset != current:
+                raise HttpError(409, f"Offset mismatch: expected {current}")
+
+            hasher = _hasher_at(upload_id, part, current)
+            remaining = length
+            try:
+                while remaining > 0:
+                    block = stream.read(min(UPLOAD_BUFFER_SIZE, remaining))
+                    if not block:
+                        break
+                    fh.write(block)
+                    hasher.update(block)
+                    remaining -= len(block)
+            finally:
+                # client putus di tengah chunk: byte yang sudah tertulis tetap sah
+                fh.flush()
+                written = os.fstat(fh.fileno()).st_size
+                _hashers.set(upload_id, (written, hasher))
+
+    if remaining > 0:
+        raise HttpError(400, f"Incomplete chunk: received {length - remaining} of {length} bytes")
+    return _status(meta, written)
+
+
+def finalize_upload(upload_id, user):
+    """
+    Verifikasi ukuran + SHA-256, pindahkan ke path dedup. Return (meta, storage
+    name). Idempoten: finalize ulang (retry / request paralel) dapat hasil sama.
+    """
+    with _locked(upload_id, user) as (meta, part, meta_path):
+        if meta.get("name"):
+            return meta, meta["name"]
+        size = part.stat().st_size
+        if size != meta["size"]:
+            raise HttpError(409, f"Upload incomplete: {size} of {meta['size']} bytes")
+        digest = _hasher_at(upload_id, part, size).hexdigest()
+        if meta["sha256"] and meta["sha256"] != digest:
+            raise HttpError(400, "SHA-256 mismatch")
+
+        ext = os.path.splitext(meta["filename"])[1].lower()
+        name = f"{DEDUP_DIR}/{digest[:2]}/{digest}{ext}"
+        target = Path(default_storage.path(name))
+        if target.exists():
+            part.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _move(part, target)
+
+        # metadata disimpan sampai expired (cleanup_uploads) untuk finalize ulang
+        meta["sha256"] = digest
+        meta["name"] = name
+        _write_meta(meta_path, meta)
+    _hashers.delete(upload_id)
+    return meta, name
+
+
+def abort_upload(upload_id, user):
+    with _locked(upload_id, user) as (_, part, meta_path):
+        part.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        # request yang antre di lock ini akan dapat 404 dari _load_meta
+        meta_path.with_suffix(".lock").unlink(missing_ok=True)
+    _hashers.delete(upload_id)
+
+
+def cleanup_expired(max_age=UPLOAD_EXPIRY) -> int:
+    """Hapus upload (dan metadata upload yang sudah di-finalize) lebih dari `max_age` detik."""
+    removed = 0
+    cutoff = time.time() - max_age
+    directory = _partial_dir()
+    if not directory.exists():
+        return 0
+    for path in directory.iterdir():
+        if path.suffix not in (".part", ".json", ".tmp", ".lock"):
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += path.suffix == ".json"
+        except FileNotFoundError:
+            continue
+    return removed
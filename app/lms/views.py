@@ -1,3 +1,26 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from .metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request):
+    """
+    GET /metrics (format Prometheus). LMS_METRICS_TOKEN diisi -> wajib Bearer
+    token itu; tanpa token endpoint hanya ada saat DEBUG.
+    """
+    token = getattr(settings, "LMS_METRICS_TOKEN", "")
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    else:
+        header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return HttpResponse(status=401)
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
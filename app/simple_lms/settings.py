@@ -1,18 +1,24 @@
 from pathlib import Path
 import os
 
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
 # (untuk UAS/docker lokal boleh hardcode dulu)
 SECRET_KEY = os.getenv(
-    "SECRET_KEY",
-    "django-insecure-27ihf6jlny&e(!4)i0^rikba3a0!1-2dyy-v0k9jz_+%^s$yph"
+    "DJANGO_SECRET_KEY",
+    os.getenv(
+        "SECRET_KEY",
+        "django-insecure-27ihf6jlny&e(!4)i0^rikba3a0!1-2dyy-v0k9jz_+%^s$yph",
+    ),
 )
 
-DEBUG = True
-ALLOWED_HOSTS = ["*"]
+# DEBUG=1 hanya untuk dev: Django menyimpan setiap query SQL di memori
+DEBUG = os.getenv("DJANGO_DEBUG", "0") == "1"
+ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "*").split(",")
 
 # Application definition
 INSTALLED_APPS = [
@@ -30,10 +36,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # paling atas: Server-Timing + histogram /metrics mencakup semua middleware
+    "lms.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
 
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # session tidak di-load/save untuk request Bearer yang tidak memakainya
+    "lms.middleware.LazySessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -60,13 +69,23 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "simple_lms.wsgi.application"
 
-# Database (SQLite untuk UAS sudah OK)
+# Database: DATABASE_URL (postgres://... atau sqlite:///...), default SQLite lokal
+# mode WAL. DATABASE_REPLICA_URL opsional -> alias "replica" untuk endpoint list.
+_conn_max_age = int(os.getenv("DJANGO_CONN_MAX_AGE", "60"))
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(
+        os.getenv("DATABASE_URL") or f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=_conn_max_age,
+    ),
 }
+if os.getenv("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = database_config(
+        os.environ["DATABASE_REPLICA_URL"], conn_max_age=_conn_max_age
+    )
+    # saat test, replica = default (tidak dibuat database test terpisah)
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["lms.db_router.ReplicaRouter"]
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -100,18 +119,92 @@ CORS_ALLOW_ALL_ORIGINS = True
 # =========================
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/1")
 
+# default = L1 in-process di depan Redis (lms/cache_backends.py);
+# hanya key course catalogue yang masuk L1, sisanya langsung ke Redis
 CACHES = {
     "default": {
+        "BACKEND": "lms.cache_backends.TwoTierCache",
+        "OPTIONS": {
+            "L2": "redis",
+            "L1_KEY_PREFIXES": ["cache:lms:"],
+            "L1_TTL": int(os.getenv("LMS_L1_CACHE_TTL", "5")),  # detik
+            "L1_MAX_ENTRIES": 1024,
+        },
+    },
+    "redis": {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": REDIS_URL,
         "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
-    }
+    },
 }
 
 # =========================
 # UAS: Redis Session (WAJIB)
 # =========================
-SESSION_ENGINE = "django.contrib.sessions.backends.cache"
-SESSION_CACHE_ALIAS = "default"
+# cache (Redis) + write-behind ke tabel django_session, lihat lms/sessions.py
+SESSION_ENGINE = "lms.sessions"
+SESSION_CACHE_ALIAS = "redis"
+LMS_SESSION_FLUSH_INTERVAL = float(os.getenv("LMS_SESSION_FLUSH_INTERVAL", "1.0"))  # detik
+LMS_SESSION_FLUSH_BATCH = int(os.getenv("LMS_SESSION_FLUSH_BATCH", "500"))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# =========================
+# JWT principal
+# =========================
+# 1 = role/username diambil dari claim token (tanpa query DB). Revocation tetap
+# berlaku di kedua mode: setiap request membandingkan claim "ver" dengan versi
+# user di Redis (lms/auth.py); simpan/hapus User -> token lamanya langsung 401.
+LMS_JWT_TRUST_CLAIMS = os.getenv("LMS_JWT_TRUST_CLAIMS", "0") == "1"
+LMS_USER_CACHE_SIZE = int(os.getenv("LMS_USER_CACHE_SIZE", "10000"))
+LMS_USER_CACHE_TTL = int(os.getenv("LMS_USER_CACHE_TTL", "30"))  # detik
+# Redis tidak bisa dihubungi: versi token terakhir per user dipakai selama
+# TTL ini, lewat dari itu request terautentikasi dijawab 503 (0 = langsung 503)
+LMS_TOKEN_VERSION_FALLBACK_TTL = int(os.getenv("LMS_TOKEN_VERSION_FALLBACK_TTL", "30"))  # detik
+
+# =========================
+# Rate limit (lms/ratelimit.py): alias cache Redis untuk Lua script;
+# kalau bukan django_redis otomatis pakai fallback in-process
+# =========================
+LMS_RATELIMIT_CACHE = "redis"
+# 0 hanya untuk load test (benchmarks/), jangan di production
+LMS_RATELIMIT_ENABLED = os.getenv("LMS_RATELIMIT_ENABLED", "1") == "1"
+
+# =========================
+# Password hashing pool (lms/hashing.py)
+# =========================
+LMS_HASH_WORKERS = int(os.getenv("LMS_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+LMS_HASH_QUEUE_DEPTH = int(os.getenv("LMS_HASH_QUEUE_DEPTH", "16"))
+LMS_VERIFIED_PASSWORD_TTL = int(os.getenv("LMS_VERIFIED_PASSWORD_TTL", "300"))  # detik
+
+# =========================
+# Chunked upload Submission.file (lms/uploads.py)
+# =========================
+LMS_UPLOAD_MAX_SIZE = int(os.getenv("LMS_UPLOAD_MAX_SIZE", str(200 * 1024 * 1024)))  # byte
+LMS_UPLOAD_CHUNK_SIZE = int(os.getenv("LMS_UPLOAD_CHUNK_SIZE", str(5 * 1024 * 1024)))  # byte
+LMS_UPLOAD_EXPIRY = int(os.getenv("LMS_UPLOAD_EXPIRY", "86400"))  # detik
+# upload yang belum selesai; harus di luar MEDIA_ROOT (media bisa disajikan publik)
+LMS_UPLOAD_PARTIAL_DIR = os.getenv("LMS_UPLOAD_PARTIAL_DIR", str(BASE_DIR / "upload_partial"))
+
+# =========================
+# Download Submission.file (lms/downloads.py)
+# nginx = X-Accel-Redirect, xsendfile = X-Sendfile, kosong = Django FileResponse
+# =========================
+LMS_SENDFILE_BACKEND = os.getenv("LMS_SENDFILE_BACKEND", "")
+LMS_SENDFILE_URL_PREFIX = os.getenv("LMS_SENDFILE_URL_PREFIX", "/protected/")
+
+# =========================
+# Metrics & profiling (lms/metrics.py, lms/middleware.py)
+# =========================
+LMS_METRICS_ENABLED = os.getenv("LMS_METRICS_ENABLED", "1") == "1"
+# Server-Timing membuka jumlah query & hit/miss cache ke client: default hanya saat DEBUG
+LMS_SERVER_TIMING = os.getenv("LMS_SERVER_TIMING", "1" if DEBUG else "0") == "1"
+# kosong = /metrics hanya terbuka saat DEBUG (production: 404 tanpa token)
+LMS_METRICS_TOKEN = os.getenv("LMS_METRICS_TOKEN", "")
+# gunicorn multi-worker: folder snapshot per worker, dijumlah oleh /metrics
+LMS_METRICS_DIR = os.getenv("LMS_METRICS_DIR", "")
+LMS_METRICS_FLUSH_INTERVAL = float(os.getenv("LMS_METRICS_FLUSH_INTERVAL", "5"))  # detik
+# 0 = profiler mati; mis. 0.01 = 1% request di-profile, disimpan kalau >= SLOW_MS
+LMS_PROFILE_SAMPLE_RATE = float(os.getenv("LMS_PROFILE_SAMPLE_RATE", "0"))
+LMS_PROFILE_SLOW_MS = int(os.getenv("LMS_PROFILE_SLOW_MS", "500"))
+LMS_PROFILE_DIR = os.getenv("LMS_PROFILE_DIR", "")  # kosong = top fungsi di-log
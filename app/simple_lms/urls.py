@@ -9,16 +9,35 @@ from django.conf.urls.static import static
 
 from ninja import NinjaAPI
 from lms.api import router as lms_router
+from lms.api_async import router as lms_async_router
+from lms.ratelimit import RateLimited
+from lms.renderers import FastJSONParser, TimedJSONRenderer
+from lms.views import metrics_view
 
 # Inisialisasi API
-api = NinjaAPI(title="Simple LMS API")
+# renderer/parser JSON: orjson kalau ter-install, fallback json stdlib
+api = NinjaAPI(
+    title="Simple LMS API", renderer=TimedJSONRenderer(), parser=FastJSONParser(),
+)
+
+
+@api.exception_handler(RateLimited)
+def rate_limited(request, exc):
+    response = api.create_response(request, {"detail": exc.message}, status=429)
+    response["Retry-After"] = str(exc.retry_after)
+    return response
+
 
 # Sesuai UAS: prefix /api/lms/...
 api.add_router("/lms", lms_router)
+# varian async (ASGI) dari endpoint baca
+api.add_router("/lms/async", lms_async_router)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", api.urls),
+    # Prometheus scrape (lms/metrics.py)
+    path("metrics", metrics_view),
 ]
 
 # Serve media files in development (DEBUG)
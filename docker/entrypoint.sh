@@ -1,9 +1,22 @@
 #!/usr/bin/env bash
 set -e
 
-# apply migration tiap container start (aman untuk dev)
-python manage.py makemigrations --noinput || true
-python manage.py migrate --noinput
+# migrasi hanya dijalankan kalau diminta (default ya untuk dev);
+# di production jalankan sekali sebagai job terpisah: DJANGO_MIGRATE=0
+if [ "${DJANGO_MIGRATE:-1}" = "1" ]; then
+  python manage.py migrate --noinput
+fi
 
-# jalanin server
-python manage.py runserver 0.0.0.0:8000
+case "${SERVER_MODE:-dev}" in
+  dev)
+    exec python manage.py runserver 0.0.0.0:8000
+    ;;
+  wsgi|asgi)
+    # worker/thread dihitung dari CPU di gunicorn.conf.py
+    exec gunicorn -c gunicorn.conf.py
+    ;;
+  *)
+    echo "Unknown SERVER_MODE: ${SERVER_MODE}" >&2
+    exit 1
+    ;;
+esac